@@ -0,0 +1,170 @@
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from bson import ObjectId
+from pymongo import DESCENDING
+import os
+
+from ingest import BatchWriter, WriterOverloaded
+
+# Audit log configuration
+AUDIT_RETENTION_DAYS = float(os.environ.get('AUDIT_RETENTION_DAYS', '365'))
+AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', '100'))
+AUDIT_BATCH_DELAY_MS = float(os.environ.get('AUDIT_BATCH_DELAY_MS', '200'))
+AUDIT_QUEUE_SIZE = int(os.environ.get('AUDIT_QUEUE_SIZE', '10000'))
+AUDIT_SPILL_PATH = os.environ.get(
+    'AUDIT_SPILL_PATH', str(Path(__file__).parent / 'spill' / 'audit_log.ndjson')
+)
+# A full queue falls back to a direct insert instead of delaying the admin call
+AUDIT_ENQUEUE_TIMEOUT_SECONDS = 0.05
+
+# Collection and key field of each audited entity; there is a single company document
+AUDIT_ENTITIES = {
+    'company': ('company_info', None),
+    'service': ('services', 'id'),
+    'project': ('projects', 'id'),
+    'message': ('contact_messages', 'id'),
+}
+
+# Messages deleted per batch by a bulk delete, each batch logged with one insert
+AUDIT_DELETE_BATCH_SIZE = 500
+
+# Bookkeeping fields that are not part of a diff
+IGNORED_FIELDS = ('_id', 'version')
+
+
+def diff(before: dict, after: dict) -> dict:
+    """Fields that differ between two versions of a document, as {"from": ..., "to": ...}."""
+    changes = {}
+    for field in sorted(before.keys() | after.keys()):
+        if field in IGNORED_FIELDS:
+            continue
+        if field in before and field in after and before[field] == after[field]:
+            continue
+        change = {}
+        if field in before:
+            change['from'] = before[field]
+        if field in after:
+            change['to'] = after[field]
+        changes[field] = change
+    return changes
+
+
+def undo(entry: dict, document: Optional[dict]) -> Optional[dict]:
+    """The entity as it was before ``entry``, given how it was right after it."""
+    if entry.get('changes') is not None:
+        if document is None:
+            raise ValueError(f"History of {entry['entity']} {entry['entityId']} is incomplete")
+        document = dict(document)
+        for field, change in entry['changes'].items():
+            if 'from' in change:
+                document[field] = change['from']
+            else:
+                document.pop(field, None)
+        return document
+    if entry['action'] == 'delete':
+        return dict(entry['document'])
+    # The entry created the entity
+    return None
+
+
+class AuditLog:
+    """Append-only history of admin changes in the ``audit_log`` collection.
+
+    Entries go through a BatchWriter, so recording one costs an enqueue.
+    History is ordered by ``(createdAt, id)``: ``id`` is an ObjectId
+    string, which breaks ties in the order one worker recorded them.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.writer = BatchWriter(
+            collection,
+            batch_size=AUDIT_BATCH_SIZE,
+            max_delay=AUDIT_BATCH_DELAY_MS / 1000,
+            max_pending=AUDIT_QUEUE_SIZE,
+            enqueue_timeout=AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+            spill_path=AUDIT_SPILL_PATH,
+        )
+        self.direct_writes = 0
+
+    def start(self):
+        self.writer.start()
+
+    async def stop(self):
+        await self.writer.stop()
+
+    async def record(self, actor: str, entity: str, entity_id: Optional[str], action: str,
+                     before: Optional[dict] = None, after: Optional[dict] = None, **extra) -> dict:
+        """Log one change; updates store a diff, creates and deletes the whole document."""
+        entry = self._entry(actor, entity, entity_id, action, before, after, **extra)
+        await self._put(entry)
+        return entry
+
+    async def record_deletes(self, actor: str, entity: str, documents: List[dict]):
+        """Log a batch of deleted documents with a single insert."""
+        if documents:
+            await self.collection.insert_many(
+                [self._entry(actor, entity, doc['id'], 'delete', before=doc) for doc in documents],
+                ordered=False
+            )
+
+    def _entry(self, actor: str, entity: str, entity_id: Optional[str], action: str,
+               before: Optional[dict] = None, after: Optional[dict] = None, **extra) -> dict:
+        entry = {
+            'id': str(ObjectId()),
+            'createdAt': datetime.utcnow(),
+            'entity': entity,
+            'entityId': entity_id,
+            'action': action,
+            'actor': actor,
+        }
+        version = (after or before or {}).get('version')
+        if version is not None:
+            entry['version'] = version
+        if before is not None and after is not None:
+            entry['changes'] = diff(before, after)
+        elif before is not None or after is not None:
+            entry['document'] = {k: v for k, v in (after or before).items() if k != '_id'}
+        entry.update(extra)
+        return entry
+
+    async def _put(self, entry: dict):
+        if self.writer.running:
+            try:
+                await self.writer.put(entry)
+                return
+            except WriterOverloaded:
+                pass
+        self.direct_writes += 1
+        await self.collection.insert_one(entry)
+
+    async def flush(self):
+        await self.writer.flush()
+
+    async def get(self, entry_id: str) -> Optional[dict]:
+        await self.writer.flush()
+        return await self.collection.find_one({'id': entry_id}, {'_id': 0})
+
+    async def state_after(self, entry: dict, current: Optional[dict]) -> Optional[dict]:
+        """The entity right after ``entry``, found by undoing every later change from ``current``."""
+        await self.writer.flush()
+        # Ordered by (createdAt, id) since ObjectIds from different workers do not interleave
+        later = self.collection.find(
+            {
+                'entity': entry['entity'],
+                'entityId': entry['entityId'],
+                '$or': [
+                    {'createdAt': {'$gt': entry['createdAt']}},
+                    {'createdAt': entry['createdAt'], 'id': {'$gt': entry['id']}},
+                ],
+            },
+            {'_id': 0}
+        ).sort([('createdAt', DESCENDING), ('id', DESCENDING)])
+        state = dict(current) if current is not None else None
+        async for newer in later:
+            state = undo(newer, state)
+        return state
+
+    def stats(self) -> dict:
+        return {**self.writer.stats(), 'directWrites': self.direct_writes}
@@ -1,24 +1,214 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import asyncio
+import hashlib
+import logging
 import os
+import time
 
 # Security configuration
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'navodaya-secret-key-2025')
 ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+# Token verification configuration
+JWT_BACKEND = os.environ.get('JWT_BACKEND', 'jose').lower()  # 'jose' or 'pyjwt'
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '1024'))
+
+logger = logging.getLogger(__name__)
+
+# Password hashing configuration
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_POOL_WORKERS = int(os.environ.get('PASSWORD_POOL_WORKERS', '2'))
+PASSWORD_POOL_MAX_QUEUE = int(os.environ.get('PASSWORD_POOL_MAX_QUEUE', '16'))
+
 security = HTTPBearer()
 
+# passlib and the JWT library are imported on first use to keep worker boot fast
+_pwd_context = None
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        # Hashes with a different cost factor than BCRYPT_ROUNDS are flagged for rehash
+        _pwd_context = CryptContext(
+            schemes=['bcrypt'], deprecated='auto',
+            bcrypt__rounds=BCRYPT_ROUNDS,
+            bcrypt__min_rounds=BCRYPT_ROUNDS, bcrypt__max_rounds=BCRYPT_ROUNDS
+        )
+    return _pwd_context
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+class PasswordPoolSaturated(Exception):
+    pass
+
+class PasswordPool:
+    """Runs bcrypt work on a bounded thread pool instead of the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real
+    parallelism. At most ``max_queue`` jobs may be running or waiting;
+    beyond that callers get ``PasswordPoolSaturated`` immediately.
+    """
+
+    def __init__(self, workers: int = PASSWORD_POOL_WORKERS,
+                 max_queue: int = PASSWORD_POOL_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._executor = None
+
+    async def run(self, func, *args):
+        if self.depth >= self.max_queue:
+            self.rejected += 1
+            raise PasswordPoolSaturated()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='bcrypt'
+            )
+        self.depth += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            elapsed = time.perf_counter() - started
+            self.depth -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            'workers': self.workers,
+            'maxQueue': self.max_queue,
+            'queueDepth': self.depth,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'avgMs': round(self.total_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            'maxMs': round(self.max_seconds * 1000, 2),
+        }
+
+password_pool = PasswordPool()
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify off the event loop; also returns a new hash when the cost factor changed."""
+    return await password_pool.run(
+        get_pwd_context().verify_and_update, plain_password, hashed_password
+    )
+
+async def hash_password(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+class TokenBackendError(Exception):
+    pass
+
+def _load_token_backend():
+    if JWT_BACKEND == 'pyjwt':
+        try:
+            import jwt as pyjwt
+        except ImportError:
+            logger.warning('JWT_BACKEND=pyjwt but PyJWT is not installed, using python-jose')
+        else:
+            def encode(claims):
+                return pyjwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+            def decode(token):
+                try:
+                    return pyjwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+                except pyjwt.InvalidTokenError as e:
+                    raise TokenBackendError(str(e))
+            return 'pyjwt', encode, decode
+
+    from jose import JWTError, jwt
+
+    def encode(claims):
+        return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+    def decode(token):
+        try:
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError as e:
+            raise TokenBackendError(str(e))
+    return 'jose', encode, decode
+
+# Resolved by _ensure_token_backend() on the first token issued or verified
+token_backend = None
+_encode_token = _decode_token = None
+
+def _ensure_token_backend():
+    global token_backend, _encode_token, _decode_token
+    if token_backend is None:
+        token_backend, _encode_token, _decode_token = _load_token_backend()
+
+class TokenCache:
+    """LRU of already-verified tokens, keyed by token digest and bounded by ``exp``."""
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.verifications = 0
+        self.verify_seconds = 0.0
+        self._entries = OrderedDict()
+
+    def get(self, digest: bytes) -> Optional[str]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        username, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return username
+
+    def set(self, digest: bytes, username: str, expires_at: float):
+        if self.max_entries <= 0:
+            return
+        self._entries[digest] = (username, expires_at)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            'backend': token_backend or JWT_BACKEND,
+            'entries': len(self._entries),
+            'maxEntries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+token_cache = TokenCache()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -27,22 +217,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({'exp': expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    _ensure_token_backend()
+    encoded_jwt = _encode_token(to_encode)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get('sub')
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail='Could not validate credentials'
-            )
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    # async so FastAPI runs it on the event loop: no threadpool hop, and token_cache
+    # is only ever touched from one thread
+    token = credentials.credentials
+    digest = hashlib.sha256(token.encode()).digest()
+    username = token_cache.get(digest)
+    if username is not None:
         return username
-    except JWTError:
+    _ensure_token_backend()
+    started = time.perf_counter()
+    try:
+        payload = _decode_token(token)
+    except TokenBackendError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Could not validate credentials'
+        )
+    finally:
+        token_cache.verifications += 1
+        token_cache.verify_seconds += time.perf_counter() - started
+    username: str = payload.get('sub')
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Could not validate credentials'
         )
+    expires_at = payload.get('exp')
+    if isinstance(expires_at, (int, float)):
+        token_cache.set(digest, username, expires_at)
+    return username
@@ -0,0 +1,218 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from compression import COMPRESSION_MIN_SIZE, compress, negotiate
+from serialization import dump_documents
+import hashlib
+import os
+import time
+
+# Cache configuration
+CATALOG_CACHE_TTL_SECONDS = float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', '300'))
+CATALOG_CACHE_MAX_ENTRIES = int(os.environ.get('CATALOG_CACHE_MAX_ENTRIES', '1024'))
+
+# Cache-Control for shared caches (CDN) in front of the public catalog
+CATALOG_MAX_AGE_SECONDS = int(os.environ.get('CATALOG_MAX_AGE_SECONDS', '60'))
+CATALOG_STALE_WHILE_REVALIDATE_SECONDS = int(
+    os.environ.get('CATALOG_STALE_WHILE_REVALIDATE_SECONDS', '300')
+)
+
+
+class VersionedCache:
+    """In-process LRU cache whose entries are tied to a version number.
+
+    Writers call ``bump()`` after changing the underlying data, which
+    invalidates every entry at once. Readers capture ``version`` before
+    loading from the database and pass it back to ``set()``, so a load
+    that raced with a write is never stored.
+    """
+
+    def __init__(self, ttl: float = CATALOG_CACHE_TTL_SECONDS,
+                 max_entries: int = CATALOG_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        version, expires_at, value = entry
+        if version != self.version or expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> bool:
+        if version is None:
+            version = self.version
+        elif version != self.version:
+            # The data changed while the caller was loading it
+            return False
+        self._entries[key] = (version, time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def bump(self) -> int:
+        self.version += 1
+        self._entries.clear()
+        return self.version
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'version': self.version,
+            'entries': len(self._entries),
+            'maxEntries': self.max_entries,
+            'ttlSeconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CachedResponse:
+    """A pre-serialized JSON body together with its strong ETag.
+
+    The ETag is a hash of the body unless the caller passes one, as the
+    single-document routes do with the document version.  Compressed variants are produced once per encoding, at the highest
+    level, and reused until the entry is invalidated.
+    """
+
+    __slots__ = ('body', 'etag', 'headers', 'variants')
+
+    def __init__(self, body: bytes, headers: Optional[dict] = None, etag: Optional[str] = None):
+        self.body = body
+        self.headers = headers or {}
+        self.variants: Dict[str, bytes] = {}
+        if etag is None:
+            digest = hashlib.sha256(body)
+            for name, value in sorted(self.headers.items()):
+                digest.update(f'\n{name}: {value}'.encode())
+            etag = '"%s"' % digest.hexdigest()[:32]
+        self.etag = etag
+
+    @classmethod
+    def render(cls, adapter, data, headers: Optional[dict] = None,
+               trusted: bool = False, etag: Optional[str] = None) -> 'CachedResponse':
+        # Serialize once against the response model, then keep the JSON bytes
+        return cls(dump_documents(adapter, data, trusted), headers, etag)
+
+    def encoded(self, encoding: str) -> bytes:
+        variant = self.variants.get(encoding)
+        if variant is None:
+            variant = self.variants[encoding] = compress(self.body, encoding, best=True)
+        return variant
+
+    def precompress(self, encodings=('br', 'gzip')):
+        if len(self.body) >= COMPRESSION_MIN_SIZE:
+            for encoding in encodings:
+                if negotiate(encoding) == encoding:
+                    self.encoded(encoding)
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Each representation gets its own strong ETag
+        return f'{self.etag[:-1]}-{encoding}"' if encoding else self.etag
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag == self.etag or (tag.startswith(self.etag[:-1] + '-') and tag.endswith('"')):
+                return True
+        return False
+
+    def to_response(self, if_none_match: Optional[str] = None,
+                    accept_encoding: Optional[str] = None) -> Response:
+        encoding = negotiate(accept_encoding) if len(self.body) >= COMPRESSION_MIN_SIZE else None
+        headers = {**self.headers, 'ETag': self.etag_for(encoding), 'Vary': 'Accept-Encoding'}
+        if self.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        if encoding is None:
+            return Response(content=self.body, media_type='application/json', headers=headers)
+        headers['Content-Encoding'] = encoding
+        return Response(content=self.encoded(encoding), media_type='application/json', headers=headers)
+
+
+CATALOG_CACHE_CONTROL = (
+    f'public, max-age={CATALOG_MAX_AGE_SECONDS}, '
+    f'stale-while-revalidate={CATALOG_STALE_WHILE_REVALIDATE_SECONDS}'
+)
+
+# (method, path prefix, Cache-Control); the first matching rule wins
+CACHE_POLICIES: List[Tuple[Optional[str], str, str]] = [
+    (None, '/api/admin/', 'no-store'),
+    ('GET', '/api/company', CATALOG_CACHE_CONTROL),
+    ('GET', '/api/services', CATALOG_CACHE_CONTROL),
+    ('GET', '/api/projects', CATALOG_CACHE_CONTROL),
+    ('GET', '/api/site', CATALOG_CACHE_CONTROL),
+    ('GET', '/api/search', CATALOG_CACHE_CONTROL),
+    (None, '/api/', 'no-store'),
+    (None, '/metrics', 'no-store'),
+    (None, '/healthz', 'no-store'),
+    (None, '/readyz', 'no-store'),
+]
+
+
+class CachePolicyMiddleware:
+    """Adds Cache-Control per route unless the response already set one.
+
+    Public policies only apply to 200 and 304 responses, so errors are
+    never stored by a shared cache.
+    """
+
+    def __init__(self, app: ASGIApp, policies=CACHE_POLICIES):
+        self.app = app
+        self.policies = policies
+
+    def policy_for(self, method: str, path: str) -> Optional[str]:
+        for rule_method, prefix, value in self.policies:
+            if (rule_method is None or rule_method == method) and path.startswith(prefix):
+                return value
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        policy = self.policy_for(scope['method'], scope['path'])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message['type'] == 'http.response.start':
+                if 'cache-control' not in Headers(raw=message['headers']):
+                    value = policy
+                    if policy.startswith('public') and message['status'] not in (200, 304):
+                        value = 'no-store'
+                    MutableHeaders(raw=message['headers'])['Cache-Control'] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Shared cache for the public catalog (company info, services, projects)
+catalog_cache = VersionedCache()
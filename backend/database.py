@@ -0,0 +1,120 @@
+from typing import Optional
+from pymongo import ReadPreference, monitoring
+from pymongo.read_concern import ReadConcern
+import os
+
+# Connection pool configuration (unset values keep the driver defaults)
+MONGO_MAX_POOL_SIZE = os.environ.get('MONGO_MAX_POOL_SIZE')
+MONGO_MIN_POOL_SIZE = os.environ.get('MONGO_MIN_POOL_SIZE')
+MONGO_MAX_IDLE_TIME_MS = os.environ.get('MONGO_MAX_IDLE_TIME_MS')
+MONGO_WAIT_QUEUE_TIMEOUT_MS = os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS')
+MONGO_SERVER_SELECTION_TIMEOUT_MS = os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS')
+MONGO_CONNECT_TIMEOUT_MS = os.environ.get('MONGO_CONNECT_TIMEOUT_MS')
+MONGO_SOCKET_TIMEOUT_MS = os.environ.get('MONGO_SOCKET_TIMEOUT_MS')
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS')  # e.g. "zstd,snappy,zlib"
+
+# Read routing for the public catalog routes
+MONGO_PUBLIC_READ_PREFERENCE = os.environ.get('MONGO_PUBLIC_READ_PREFERENCE', 'primary')
+MONGO_PUBLIC_READ_CONCERN = os.environ.get('MONGO_PUBLIC_READ_CONCERN')
+
+# Server-side deadlines (maxTimeMS) per route class
+PUBLIC_QUERY_TIMEOUT_MS = int(os.environ.get('PUBLIC_QUERY_TIMEOUT_MS', '2000'))
+ADMIN_QUERY_TIMEOUT_MS = int(os.environ.get('ADMIN_QUERY_TIMEOUT_MS', '10000'))
+
+READ_PREFERENCES = {
+    'primary': ReadPreference.PRIMARY,
+    'primarypreferred': ReadPreference.PRIMARY_PREFERRED,
+    'secondary': ReadPreference.SECONDARY,
+    'secondarypreferred': ReadPreference.SECONDARY_PREFERRED,
+    'nearest': ReadPreference.NEAREST,
+}
+
+
+def client_options() -> dict:
+    """Keyword arguments for AsyncIOMotorClient built from the environment."""
+    options = {}
+    integer_options = {
+        'maxPoolSize': MONGO_MAX_POOL_SIZE,
+        'minPoolSize': MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': MONGO_MAX_IDLE_TIME_MS,
+        'waitQueueTimeoutMS': MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        'serverSelectionTimeoutMS': MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'connectTimeoutMS': MONGO_CONNECT_TIMEOUT_MS,
+        'socketTimeoutMS': MONGO_SOCKET_TIMEOUT_MS,
+    }
+    for name, value in integer_options.items():
+        if value:
+            options[name] = int(value)
+    if MONGO_COMPRESSORS:
+        options['compressors'] = MONGO_COMPRESSORS
+    return options
+
+
+def public_database(client, name: str):
+    """Database handle used by the public read routes, with their read preference and concern."""
+    read_preference = READ_PREFERENCES.get(MONGO_PUBLIC_READ_PREFERENCE.lower())
+    if read_preference is None:
+        raise ValueError(f"Unknown MONGO_PUBLIC_READ_PREFERENCE: {MONGO_PUBLIC_READ_PREFERENCE}")
+    read_concern: Optional[ReadConcern] = None
+    if MONGO_PUBLIC_READ_CONCERN:
+        read_concern = ReadConcern(MONGO_PUBLIC_READ_CONCERN)
+    return client.get_database(name, read_preference=read_preference, read_concern=read_concern)
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks connection pool usage across all servers the client talks to."""
+
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.in_use += 1
+        self.checkouts += 1
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+    def stats(self) -> dict:
+        options = client_options()
+        return {
+            'maxPoolSize': options.get('maxPoolSize', 100),
+            'open': self.open,
+            'inUse': self.in_use,
+            'checkouts': self.checkouts,
+            'checkoutFailures': self.checkout_failures,
+            'poolClears': self.pool_clears,
+        }
+
+
+pool_monitor = PoolMonitor()
@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from pymongo import ASCENDING
+import csv
+import io
+import json
+
+from pagination import keyset_filter, keyset_sort, decode_cursor
+
+EXPORT_BATCH_SIZE = 500
+# Rows buffered before a chunk is handed to the response
+EXPORT_CHUNK_ROWS = 200
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def export_cursor(collection, after: Optional[str] = None):
+    """Cursor over a whole collection in (createdAt, id) order, resumable with ``after``."""
+    query = keyset_filter(decode_cursor(after), ASCENDING) if after else {}
+    return collection.find(query, {'_id': 0}).sort(keyset_sort(ASCENDING)).batch_size(EXPORT_BATCH_SIZE)
+
+
+async def stream_ndjson(cursor) -> AsyncIterator[bytes]:
+    lines = []
+    async for doc in cursor:
+        lines.append(json.dumps(doc, default=_json_default))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield ('\n'.join(lines) + '\n').encode()
+            lines = []
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+async def stream_csv(cursor, columns: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    rows = 0
+    async for doc in cursor:
+        writer.writerow({column: _csv_value(doc.get(column)) for column in columns})
+        rows += 1
+        if rows >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
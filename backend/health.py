@@ -0,0 +1,134 @@
+from typing import Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+import asyncio
+import logging
+import os
+import signal
+import time
+
+# Drain configuration
+SHUTDOWN_READINESS_DELAY_SECONDS = float(os.environ.get('SHUTDOWN_READINESS_DELAY_SECONDS', '5'))
+DRAIN_TIMEOUT_SECONDS = float(os.environ.get('DRAIN_TIMEOUT_SECONDS', '20'))
+# Mongo ping results are reused for this long so probes stay cheap
+READINESS_PING_TTL_SECONDS = float(os.environ.get('READINESS_PING_TTL_SECONDS', '2'))
+READINESS_PING_TIMEOUT_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """Startup progress, in-flight request count and drain state of this worker."""
+
+    def __init__(self):
+        self.seeded = False
+        self.catalog_warm = False
+        # Version of the catalog snapshot able to serve public reads without MongoDB
+        self.snapshot: Optional[int] = None
+        self.draining = False
+        self.in_flight = 0
+        self.index_task: Optional[asyncio.Task] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._ping_ok = False
+        self._ping_checked = 0.0
+
+    async def ping(self, client) -> bool:
+        now = time.monotonic()
+        if now - self._ping_checked < READINESS_PING_TTL_SECONDS:
+            return self._ping_ok
+        try:
+            await asyncio.wait_for(client.admin.command('ping'), READINESS_PING_TIMEOUT_SECONDS)
+            self._ping_ok = True
+        except Exception:
+            self._ping_ok = False
+        self._ping_checked = time.monotonic()
+        return self._ping_ok
+
+    def indexes_status(self) -> str:
+        if self.index_task is None or not self.index_task.done():
+            return 'pending'
+        if self.index_task.cancelled() or self.index_task.exception() or not self.index_task.result():
+            return 'failed'
+        return 'ok'
+
+    async def readiness(self, client) -> dict:
+        indexes = self.indexes_status()
+        checks = {
+            'draining': self.draining,
+            'mongo': await self.ping(client),
+            # A failed provisioning is reported but must not keep the worker out of rotation
+            'indexes': indexes,
+            'seeded': self.seeded,
+            'catalogWarm': self.catalog_warm,
+            'snapshot': self.snapshot,
+        }
+        checks['ready'] = not self.draining and self.catalog_warm and (
+            self.snapshot is not None
+            or checks['mongo'] and indexes != 'pending' and self.seeded
+        )
+        return checks
+
+    async def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS):
+        """Stop advertising readiness and wait for in-flight requests to finish."""
+        self.draining = True
+        deadline = time.monotonic() + timeout
+        while self.in_flight > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self.in_flight:
+            logger.warning(f"Drain timed out with {self.in_flight} requests in flight")
+
+    def install_signal_handler(self, delay: float = SHUTDOWN_READINESS_DELAY_SECONDS,
+                               timeout: float = DRAIN_TIMEOUT_SECONDS):
+        """Leave rotation on SIGTERM before the server starts shutting down.
+
+        uvicorn registers its SIGTERM handler on the event loop before the
+        app starts. It is replaced by one that marks the worker as draining,
+        keeps serving for ``delay`` seconds so load balancers see /readyz
+        fail, waits up to ``timeout`` for in-flight requests and only then
+        calls uvicorn's handler, which stops accepting connections. A second
+        SIGTERM shuts down at once.
+        """
+        loop = asyncio.get_running_loop()
+        # asyncio keeps no public accessor for an installed signal handler
+        server_handler = getattr(loop, '_signal_handlers', {}).get(signal.SIGTERM)
+        if server_handler is None:
+            # Not running under a server that handles SIGTERM on this loop (e.g. a test client)
+            return
+
+        def shut_down():
+            server_handler._run()
+
+        async def leave_rotation():
+            logger.info(f"SIGTERM received, leaving rotation for {delay:.0f}s before shutdown")
+            self.draining = True
+            await asyncio.sleep(delay)
+            await self.drain(timeout)
+            shut_down()
+
+        def handle_sigterm():
+            if self._drain_task is not None:
+                shut_down()
+                return
+            self._drain_task = loop.create_task(leave_rotation())
+
+        loop.add_signal_handler(signal.SIGTERM, handle_sigterm)
+
+
+class InFlightMiddleware:
+    """Counts HTTP requests currently being handled."""
+
+    def __init__(self, app: ASGIApp, lifecycle: Lifecycle):
+        self.app = app
+        self.lifecycle = lifecycle
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        self.lifecycle.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.lifecycle.in_flight -= 1
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,190 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel, monitoring
+import asyncio
+import logging
+import os
+
+from audit import AUDIT_RETENTION_DAYS
+from spam import SPAM_QUARANTINE_DAYS
+
+# Queries slower than this are logged as warnings
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+
+logger = logging.getLogger(__name__)
+
+# Indexes every collection is expected to have, keyed by collection name
+REQUIRED_INDEXES = {
+    'admin_users': [
+        IndexModel([('username', ASCENDING)], name='username_unique', unique=True),
+    ],
+    'services': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+    ],
+    'projects': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('createdAt', ASCENDING), ('id', ASCENDING)], name='createdAt_id'),
+        IndexModel(
+            [('category', ASCENDING), ('createdAt', ASCENDING), ('id', ASCENDING)],
+            name='category_createdAt_id'
+        ),
+        IndexModel(
+            [('year', ASCENDING), ('createdAt', ASCENDING), ('id', ASCENDING)],
+            name='year_createdAt_id'
+        ),
+    ],
+    'contact_messages': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('createdAt', DESCENDING), ('id', DESCENDING)], name='createdAt_id_desc'),
+        IndexModel(
+            [('isRead', ASCENDING), ('createdAt', DESCENDING), ('id', DESCENDING)],
+            name='isRead_createdAt_id_desc'
+        ),
+    ],
+    # Contact messages held back by the spam filter
+    'contact_quarantine': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('createdAt', DESCENDING), ('id', DESCENDING)], name='createdAt_id_desc'),
+        IndexModel(
+            [('createdAt', ASCENDING)], name='createdAt_ttl',
+            expireAfterSeconds=int(SPAM_QUARANTINE_DAYS * 86400)
+        ),
+    ],
+    'media_assets': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('url', ASCENDING)], name='url'),
+    ],
+    'audit_log': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('createdAt', DESCENDING), ('id', DESCENDING)], name='createdAt_id_desc'),
+        IndexModel(
+            [('entity', ASCENDING), ('entityId', ASCENDING), ('createdAt', DESCENDING), ('id', DESCENDING)],
+            name='entity_entityId_createdAt_id_desc'
+        ),
+        IndexModel(
+            [('actor', ASCENDING), ('createdAt', DESCENDING), ('id', DESCENDING)],
+            name='actor_createdAt_id_desc'
+        ),
+        # Entries older than AUDIT_RETENTION_DAYS are removed by MongoDB
+        IndexModel(
+            [('createdAt', ASCENDING)], name='createdAt_ttl',
+            expireAfterSeconds=int(AUDIT_RETENTION_DAYS * 86400)
+        ),
+    ],
+    # Shared rate limit buckets (RATE_LIMIT_BACKEND=mongo) expire once refilled
+    'rate_limits': [
+        IndexModel([('expiresAt', ASCENDING)], name='expiresAt_ttl', expireAfterSeconds=0),
+    ],
+}
+
+# Index options that must match for an existing index to count as reconciled
+INDEX_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression')
+
+
+def _index_signature(spec: dict) -> tuple:
+    key = tuple((field, int(direction) if isinstance(direction, (int, float)) else direction)
+                for field, direction in spec['key'].items())
+    options = tuple((name, spec[name]) for name in INDEX_OPTIONS if spec.get(name))
+    return key, options
+
+
+async def reconcile_indexes(collection, required) -> dict:
+    """Create missing indexes and rebuild ones whose definition drifted."""
+    existing = {}
+    async for spec in collection.list_indexes():
+        existing[spec['name']] = _index_signature(spec)
+    existing_keys = {signature[0]: name for name, signature in existing.items()}
+
+    to_create = []
+    for index in required:
+        document = index.document
+        name = document['name']
+        signature = _index_signature(document)
+        if existing.get(name) == signature:
+            continue
+        if name in existing:
+            logger.info(f"Rebuilding index {collection.name}.{name}")
+            await collection.drop_index(name)
+        elif signature[0] in existing_keys:
+            other = existing_keys[signature[0]]
+            if existing[other] == signature:
+                continue
+            logger.info(f"Replacing index {collection.name}.{other} with {name}")
+            await collection.drop_index(other)
+        to_create.append(index)
+
+    if to_create:
+        await collection.create_indexes(to_create)
+        logger.info(
+            f"Created indexes on {collection.name}: "
+            f"{', '.join(index.document['name'] for index in to_create)}"
+        )
+    return {'created': len(to_create)}
+
+
+async def ensure_indexes(db, required=REQUIRED_INDEXES) -> bool:
+    """Reconcile all declared indexes; returns True when every collection succeeded."""
+    names = list(required)
+    results = await asyncio.gather(
+        *(reconcile_indexes(db[name], required[name]) for name in names),
+        return_exceptions=True
+    )
+    ok = True
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.error(f"Index provisioning failed for {name}: {result}")
+            ok = False
+    return ok
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """Logs MongoDB commands that exceed the latency budget and reports timings."""
+
+    # Commands that are not queries against a user collection
+    IGNORED_COMMANDS = frozenset({
+        'hello', 'isMaster', 'ismaster', 'ping', 'saslStart', 'saslContinue',
+        'endSessions', 'buildInfo', 'getMore', 'killCursors',
+    })
+
+    def __init__(self, budget_ms: float = SLOW_QUERY_MS, observer=None):
+        self.budget_micros = budget_ms * 1000
+        self.slow_queries = 0
+        # Called as observer(collection, command_name, seconds, failed) for every command
+        self.observer = observer
+        self._pending = {}
+
+    def started(self, event):
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        command = event.command
+        query = command.get('filter') or command.get('q') or {}
+        if not isinstance(query, dict):
+            query = {}
+        # Only the shape of the filter is kept, never the values
+        self._pending[(event.connection_id, event.request_id)] = (
+            command.get(event.command_name), tuple(query)
+        )
+
+    def succeeded(self, event):
+        self._finish(event, 'ok')
+
+    def failed(self, event):
+        self._finish(event, 'failed')
+
+    def _finish(self, event, outcome):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        if self.observer is not None:
+            self.observer(
+                pending[0], event.command_name, event.duration_micros / 1e6, outcome == 'failed'
+            )
+        if event.duration_micros < self.budget_micros:
+            return
+        self.slow_queries += 1
+        collection, filter_keys = pending
+        logger.warning(
+            f"Slow query ({outcome}): {event.command_name} on {collection} "
+            f"filter={list(filter_keys)} took {event.duration_micros / 1000:.1f}ms"
+        )
+
+
+query_monitor = QueryMonitor()
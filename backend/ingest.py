@@ -0,0 +1,292 @@
+from pathlib import Path
+from typing import List, Optional, Set
+from bson import json_util
+from pymongo.errors import BulkWriteError, PyMongoError
+import asyncio
+import logging
+import os
+import uuid
+
+# Contact ingestion configuration: "sync" inserts inline, "batched" uses BatchWriter
+CONTACT_INGEST_MODE = os.environ.get('CONTACT_INGEST_MODE', 'sync').lower()
+CONTACT_BATCH_SIZE = int(os.environ.get('CONTACT_BATCH_SIZE', '100'))
+CONTACT_BATCH_DELAY_MS = float(os.environ.get('CONTACT_BATCH_DELAY_MS', '50'))
+CONTACT_QUEUE_SIZE = int(os.environ.get('CONTACT_QUEUE_SIZE', '5000'))
+CONTACT_ENQUEUE_TIMEOUT_MS = float(os.environ.get('CONTACT_ENQUEUE_TIMEOUT_MS', '250'))
+CONTACT_SPILL_PATH = os.environ.get(
+    'CONTACT_SPILL_PATH', str(Path(__file__).parent / 'spill' / 'contact_messages.ndjson')
+)
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Queued after the last document to make the writer flush and exit
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class WriterOverloaded(Exception):
+    pass
+
+
+class BatchWriter:
+    """Write-behind queue that coalesces documents into ``insert_many`` batches.
+
+    A batch is flushed when it reaches ``batch_size`` documents or when its
+    oldest document has waited ``max_delay`` seconds. ``put`` applies
+    backpressure once ``max_pending`` documents are queued. Batches that
+    cannot be written are appended to a local NDJSON spill file and
+    replayed once MongoDB accepts writes again.
+
+    ``spill_path`` is a template: each process spills to
+    ``<stem>.<pid><suffix>`` beside it, and replays its own files plus
+    those left by processes that have exited. Files are claimed by
+    renaming them, so two workers never replay the same file.
+    """
+
+    def __init__(self, collection, batch_size: int, max_delay: float,
+                 max_pending: int, enqueue_timeout: float,
+                 spill_path: Optional[str] = None):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.enqueue_timeout = enqueue_timeout
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.written = 0
+        self.batches = 0
+        self.spilled = 0
+        self.rejected = 0
+        self._max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # id() of documents not yet handed to insert_many
+        self._queued: Set[int] = set()
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def put(self, document: dict):
+        self._queued.add(id(document))
+        try:
+            self._queue.put_nowait(document)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(document), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self._queued.discard(id(document))
+                self.rejected += 1
+                raise WriterOverloaded()
+
+    def holds(self, document: dict) -> bool:
+        """True until ``document``'s batch is handed to ``insert_many``.
+
+        Changes made to it now are written with it.  Afterwards it may already
+        be serialized, so callers must update the stored document instead.
+        """
+        return id(document) in self._queued
+
+    async def flush(self):
+        """Wait until every document queued so far has been written or spilled."""
+        if self._task is not None:
+            await self._queue.join()
+
+    async def stop(self):
+        """Stop accepting work and flush everything still queued."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(_STOP)
+        try:
+            await task
+        except Exception:
+            # Shutdown must go on to close everything else
+            logger.exception(f"Writer for {self.collection.name} failed while stopping")
+
+    def stats(self) -> dict:
+        return {
+            'pending': self._queue.qsize() if self._queue else 0,
+            'written': self.written,
+            'batches': self.batches,
+            'spilled': self.spilled,
+            'rejected': self.rejected,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        await self._replay_spill()
+        stopping = False
+        while not stopping:
+            document = await self._queue.get()
+            if document is _STOP:
+                self._queue.task_done()
+                break
+            batch = [document]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    document = self._queue.get_nowait()
+                else:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        document = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if document is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(document)
+            # insert_many may serialize the batch at any point from here on
+            for document in batch:
+                self._queued.discard(id(document))
+            try:
+                written = await self._write(batch)
+            except Exception:
+                logger.exception(f"Unexpected error writing a batch to {self.collection.name}")
+                await self._spill(batch)
+                written = False
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if written:
+                await self._replay_spill()
+
+    async def _insert(self, documents: List[dict]):
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # Duplicates come from replaying a partially written batch
+            errors = [error for error in e.details.get('writeErrors', [])
+                      if error.get('code') != DUPLICATE_KEY_ERROR]
+            if errors or e.details.get('writeConcernErrors'):
+                raise
+
+    async def _write(self, batch: List[dict]) -> bool:
+        if not batch:
+            return True
+        try:
+            await self._insert(batch)
+        except PyMongoError as e:
+            logger.error(f"Batch insert into {self.collection.name} failed: {e}")
+            await self._spill(batch)
+            return False
+        self.written += len(batch)
+        self.batches += 1
+        return True
+
+    def _spill_file(self) -> Path:
+        return self.spill_path.with_name(f'{self.spill_path.stem}.{os.getpid()}{self.spill_path.suffix}')
+
+    def _rejected_file(self) -> Path:
+        # Spilled lines that could not be parsed, kept for inspection
+        return self.spill_path.with_name(f'{self.spill_path.stem}.rejected{self.spill_path.suffix}')
+
+    async def _spill(self, batch: List[dict]):
+        if self.spill_path is None:
+            logger.error(f"Dropped {len(batch)} documents for {self.collection.name}")
+            return
+        for document in batch:
+            document.pop('_id', None)
+        path = self._spill_file()
+        try:
+            lines = ''.join(json_util.dumps(document) + '\n' for document in batch)
+            await asyncio.to_thread(_append_lines, path, lines)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Dropped {len(batch)} documents for {self.collection.name}: {e}")
+            return
+        self.spilled += len(batch)
+        logger.warning(f"Spilled {len(batch)} documents to {path}")
+
+    def _claim_spills(self) -> List[Path]:
+        """Spill files this process should replay, renamed to ``.replaying`` files it owns."""
+        pid = os.getpid()
+        stem, suffix = self.spill_path.stem, self.spill_path.suffix
+        claimed = []
+        for path in sorted(self.spill_path.parent.glob(f'{stem}.*')):
+            if path.suffix not in (suffix, '.replaying') or path == self._rejected_file():
+                continue
+            owner = _spill_owner(path, stem)
+            if path.suffix == '.replaying' and owner == pid:
+                # Left over from an earlier replay that was deferred
+                claimed.append(path)
+                continue
+            if owner != pid and owner is not None and _process_alive(owner):
+                continue
+            target = path.with_name(f'{stem}.{pid}-{uuid.uuid4().hex[:8]}.replaying')
+            try:
+                path.replace(target)
+            except FileNotFoundError:
+                # Another worker claimed it first
+                continue
+            claimed.append(target)
+        return claimed
+
+    def _read_spill(self, path: Path) -> List[dict]:
+        documents, bad = [], []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    documents.append(json_util.loads(line))
+                except ValueError:
+                    # e.g. a line cut short by a crash while appending
+                    bad.append(line if line.endswith('\n') else line + '\n')
+        if bad:
+            rejected = self._rejected_file()
+            _append_lines(rejected, ''.join(bad))
+            logger.error(f"Moved {len(bad)} unreadable spilled lines for {self.collection.name} to {rejected}")
+        return documents
+
+    async def _replay_spill(self):
+        if self.spill_path is None:
+            return
+        try:
+            for path in await asyncio.to_thread(self._claim_spills):
+                documents = await asyncio.to_thread(self._read_spill, path)
+                for start in range(0, len(documents), self.batch_size):
+                    try:
+                        await self._insert(documents[start:start + self.batch_size])
+                    except PyMongoError as e:
+                        logger.warning(f"Spill replay for {self.collection.name} deferred: {e}")
+                        return
+                path.unlink(missing_ok=True)
+                self.written += len(documents)
+                logger.info(f"Replayed {len(documents)} spilled documents into {self.collection.name}")
+        except Exception:
+            # A broken spill file must not stop new documents from being written
+            logger.exception(f"Spill replay for {self.collection.name} failed")
+
+
+def _spill_owner(path: Path, stem: str) -> Optional[int]:
+    """PID in ``<stem>.<pid><suffix>`` or ``<stem>.<pid>-<tag>.replaying``; None for the
+    shared file earlier versions wrote, which any process may claim."""
+    tag = path.name[len(stem) + 1:].split('.')[0].split('-')[0]
+    return int(tag) if tag.isdigit() else None
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _append_lines(path: Path, lines: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
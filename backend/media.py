@@ -0,0 +1,245 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import asyncio
+import io
+import logging
+import mimetypes
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+
+try:
+    from PIL import Image, features
+except ImportError:  # optional: pip install Pillow
+    Image = None
+
+# Media storage and processing configuration
+MEDIA_STORE = os.environ.get('MEDIA_STORE', 'local').lower()
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', str(Path(__file__).parent / 'media'))
+MEDIA_URL_PREFIX = '/api/media'
+MEDIA_MAX_UPLOAD_BYTES = int(os.environ.get('MEDIA_MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+MEDIA_WIDTHS = tuple(int(w) for w in os.environ.get('MEDIA_WIDTHS', '320,640,1280').split(',') if w)
+MEDIA_FORMATS = tuple(f for f in os.environ.get('MEDIA_FORMATS', 'webp,avif').lower().split(',') if f)
+MEDIA_WORKERS = int(os.environ.get('MEDIA_WORKERS', '2'))
+MEDIA_QUALITY = int(os.environ.get('MEDIA_QUALITY', '80'))
+
+# Keys are content-addressed, so a URL always refers to the same bytes
+MEDIA_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+MEDIA_KEY_PATTERN = re.compile(r'^[0-9a-f]{32}/[A-Za-z0-9_.-]+$')
+
+UPLOAD_TYPES = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+}
+
+logger = logging.getLogger(__name__)
+
+
+class MediaStore(ABC):
+    """Where originals and variants live. Subclasses implement these for other backends."""
+
+    @abstractmethod
+    def save(self, key: str, data: bytes):
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int, end: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        ...
+
+    @abstractmethod
+    def read(self, key: str) -> bytes:
+        ...
+
+
+class LocalMediaStore(MediaStore):
+    def __init__(self, root: str = MEDIA_ROOT):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def save(self, key: str, data: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.upload-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return self._path(key).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def iter_range(self, key: str, start: int, end: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield bytes ``start`` to ``end`` inclusive."""
+        with open(self._path(key), 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def read(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+
+def build_media_store() -> MediaStore:
+    if MEDIA_STORE == 'local':
+        return LocalMediaStore()
+    raise ValueError(f"Unknown MEDIA_STORE: {MEDIA_STORE}")
+
+
+def media_url(key: str) -> str:
+    return f'{MEDIA_URL_PREFIX}/{key}'
+
+
+def content_type_for(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or 'application/octet-stream'
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive (start, end).
+
+    Returns None when the whole file should be sent (no header, or several
+    ranges, which we answer with 200) and raises ValueError when the range
+    cannot be satisfied.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[6:].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError('unsatisfiable range')
+    return start, end
+
+
+def render_variants(data: bytes, widths: Tuple[int, ...], formats: Tuple[str, ...],
+                    quality: int) -> dict:
+    """Decode an image and encode its resized variants. Runs in a worker process."""
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        width, height = image.size
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        targets = sorted({w for w in widths if w < width} | {width})
+        supported = [f for f in formats if f == 'webp' and features.check('webp')
+                     or f == 'avif' and features.check('avif')]
+        variants = []
+        for target in targets:
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS
+            )
+            for fmt in supported:
+                out = io.BytesIO()
+                resized.save(out, fmt.upper(), quality=quality)
+                variants.append({
+                    'width': resized.size[0], 'height': resized.size[1],
+                    'format': fmt, 'data': out.getvalue(),
+                })
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+class MediaPipeline:
+    """Generates image variants on a process pool, off the event loop.
+
+    Decoding and encoding images is CPU-bound and holds the GIL, so unlike
+    bcrypt it needs processes rather than threads.
+    """
+
+    def __init__(self, store: MediaStore, workers: int = MEDIA_WORKERS):
+        self.store = store
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks = set()
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def submit(self, digest: str, original_key: str, on_done):
+        """Process in the background and call ``await on_done(digest, result)``; result is None on failure."""
+        task = asyncio.create_task(self._run(digest, original_key, on_done))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, digest: str, original_key: str, on_done):
+        result = None
+        started = time.perf_counter()
+        try:
+            result = await self.process(digest, original_key)
+            self.processed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Image processing failed for {original_key}: {e}")
+        self.total_seconds += time.perf_counter() - started
+        await on_done(digest, result)
+
+    async def process(self, digest: str, original_key: str) -> dict:
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self.store.read, original_key)
+        if not self.available:
+            logger.warning('Pillow is not installed, serving the original image only')
+            return {'width': None, 'height': None, 'variants': []}
+        if self._executor is None:
+            # Fork would copy the server's event loop, sockets and Motor threads into the workers
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        rendered = await loop.run_in_executor(
+            self._executor, render_variants, data, MEDIA_WIDTHS, MEDIA_FORMATS, MEDIA_QUALITY
+        )
+        variants: List[dict] = []
+        for variant in rendered['variants']:
+            key = f"{digest}/{variant['width']}.{variant['format']}"
+            await loop.run_in_executor(None, self.store.save, key, variant['data'])
+            variants.append({
+                'url': media_url(key), 'width': variant['width'],
+                'height': variant['height'], 'format': variant['format'],
+            })
+        return {'width': rendered['width'], 'height': rendered['height'], 'variants': variants}
+
+    async def stop(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            'available': self.available,
+            'pending': len(self._tasks),
+            'processed': self.processed,
+            'failed': self.failed,
+            'avgMs': round(self.total_seconds / self.processed * 1000, 2) if self.processed else 0.0,
+        }
@@ -0,0 +1,171 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import os
+import time
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+
+# Latency bucket upper bounds in seconds
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+class Histogram:
+    """Fixed-bucket histogram; observing a value never allocates."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        prefix = f'{labels},' if labels else ''
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class RouteStats:
+    __slots__ = ('labels', 'latency', 'statuses')
+
+    def __init__(self, method: str, route: str):
+        # Label strings are rendered once, when the route is first seen
+        self.labels = _labels(method=method, route=route)
+        self.latency = Histogram(REQUEST_BUCKETS)
+        self.statuses = [0] * len(STATUS_CLASSES)
+
+
+class MongoStats:
+    __slots__ = ('labels', 'latency', 'failures')
+
+    def __init__(self, collection: str, command: str):
+        self.labels = _labels(collection=collection, command=command)
+        self.latency = Histogram(MONGO_BUCKETS)
+        self.failures = 0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.mongo: Dict[Tuple[str, str], MongoStats] = {}
+        self.in_flight = 0
+        # Callables returning (name, type, help, [(labels, value), ...]) at scrape time
+        self.collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats(method, route)
+        stats.latency.observe(seconds)
+        index = status // 100 - 1
+        if 0 <= index < len(STATUS_CLASSES):
+            stats.statuses[index] += 1
+
+    def observe_mongo(self, collection, command: str, seconds: float, failed: bool):
+        key = (collection if isinstance(collection, str) else '', command)
+        stats = self.mongo.get(key)
+        if stats is None:
+            stats = self.mongo[key] = MongoStats(*key)
+        stats.latency.observe(seconds)
+        if failed:
+            stats.failures += 1
+
+    def render(self) -> str:
+        lines = [
+            '# HELP http_requests_in_flight Requests currently being served',
+            '# TYPE http_requests_in_flight gauge',
+            f'http_requests_in_flight {self.in_flight}',
+            '# HELP http_request_duration_seconds Request latency by route',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        routes = list(self.routes.values())
+        for stats in routes:
+            lines.extend(stats.latency.render('http_request_duration_seconds', stats.labels))
+        lines += [
+            '# HELP http_responses_total Responses by route and status class',
+            '# TYPE http_responses_total counter',
+        ]
+        for stats in routes:
+            for status, count in zip(STATUS_CLASSES, stats.statuses):
+                if count:
+                    lines.append(f'http_responses_total{{{stats.labels},status="{status}"}} {count}')
+        lines += [
+            '# HELP mongo_command_duration_seconds MongoDB command latency by collection',
+            '# TYPE mongo_command_duration_seconds histogram',
+        ]
+        mongo = list(self.mongo.values())
+        for stats in mongo:
+            lines.extend(stats.latency.render('mongo_command_duration_seconds', stats.labels))
+        lines += [
+            '# HELP mongo_command_failures_total Failed MongoDB commands by collection',
+            '# TYPE mongo_command_failures_total counter',
+        ]
+        for stats in mongo:
+            lines.append(f'mongo_command_failures_total{{{stats.labels}}} {stats.failures}')
+        for collector in self.collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{{{labels}}} {value}' if labels else f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Records per-route latency and status classes for every HTTP request."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        registry = self.registry
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_flight -= 1
+            # The router stores the matched route on the shared scope
+            route = scope.get('route')
+            registry.observe_request(
+                scope['method'], route.path if route is not None else 'unmatched',
+                status, time.perf_counter() - started
+            )
+
+
+metrics = MetricsRegistry()
@@ -1,8 +1,16 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 import uuid
 
+# Image Variant Model
+# Resized/re-encoded copy of an uploaded image
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
 # Company Info Model
 class CompanyInfo(BaseModel):
     name: str
@@ -16,6 +24,9 @@ class CompanyInfo(BaseModel):
     coordinates: dict
     mapLink: str
     logo: str
+    logoVariants: Optional[List[ImageVariant]] = None
+    # Incremented by every admin write; checked against If-Match
+    version: int = 0
 
 class CompanyInfoUpdate(BaseModel):
     name: Optional[str] = None
@@ -38,6 +49,7 @@ class Service(BaseModel):
     description: str
     features: List[str]
     detailedContent: Optional[str] = None
+    version: int = 0
 
 class ServiceCreate(BaseModel):
     category: str
@@ -63,6 +75,10 @@ class Project(BaseModel):
     image: str
     detailedContent: Optional[str] = None
     technologies: Optional[List[str]] = None
+    imageVariants: Optional[List[ImageVariant]] = None
+    # Set when the project is created; older and seeded projects have none
+    createdAt: Optional[datetime] = None
+    version: int = 0
 
 class ProjectCreate(BaseModel):
     title: str
@@ -90,12 +106,107 @@ class ContactMessage(BaseModel):
     message: str
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     isRead: bool = False
+    # Identical messages from the same sender merged into this one
+    duplicateCount: int = 0
+    lastSeenAt: Optional[datetime] = None
+
+class QuarantinedMessage(ContactMessage):
+    reason: str
+    score: int = 0
 
 class ContactMessageCreate(BaseModel):
     name: str
     email: str
     message: str
 
+# Search Result Model
+class SearchHit(BaseModel):
+    type: str
+    id: str
+    title: str
+    description: str
+    score: float
+
+# Media Model
+class MediaAsset(BaseModel):
+    id: str
+    url: str
+    contentType: str
+    size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[ImageVariant] = []
+    status: Literal["processing", "ready", "failed"] = "processing"
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+
+# Site bootstrap Model
+class SiteBootstrap(BaseModel):
+    company: Optional[CompanyInfo] = None
+    services: List[Service]
+    projects: List[Project]
+    projectsNextCursor: Optional[str] = None
+
+# Bulk Operation Models
+class ServiceBulkUpdate(ServiceUpdate):
+    id: str
+
+class ServiceBulkRequest(BaseModel):
+    create: List[ServiceCreate] = Field(default_factory=list)
+    update: List[ServiceBulkUpdate] = Field(default_factory=list)
+    delete: List[str] = Field(default_factory=list)
+
+class ProjectBulkUpdate(ProjectUpdate):
+    id: str
+
+class ProjectBulkRequest(BaseModel):
+    create: List[ProjectCreate] = Field(default_factory=list)
+    update: List[ProjectBulkUpdate] = Field(default_factory=list)
+    delete: List[str] = Field(default_factory=list)
+
+class BulkItemResult(BaseModel):
+    op: str
+    id: str
+    status: str
+    detail: Optional[str] = None
+
+class BulkResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    results: List[BulkItemResult] = Field(default_factory=list)
+
+class MessageBulkAction(BaseModel):
+    action: Literal["mark_read", "mark_unread", "delete"]
+    ids: Optional[List[str]] = None
+    isRead: Optional[bool] = None
+    email: Optional[str] = None
+    before: Optional[datetime] = None
+    after: Optional[datetime] = None
+
+class MessageBulkResult(BaseModel):
+    action: str
+    matched: int
+    affected: int
+
+# Audit Log Model
+class AuditEntry(BaseModel):
+    id: str
+    createdAt: datetime
+    entity: str
+    entityId: Optional[str] = None
+    action: str
+    actor: str
+    version: Optional[int] = None
+    # Per field {"from": ..., "to": ...}; a missing side means the field did not exist
+    changes: Optional[Dict[str, Dict[str, Any]]] = None
+    # The whole document, for creates and deletes
+    document: Optional[Dict[str, Any]] = None
+    # Filter and match count of bulk message actions
+    filter: Optional[Dict[str, Any]] = None
+    count: Optional[int] = None
+    restoredFrom: Optional[str] = None
+
 # Admin User Model
 class AdminUser(BaseModel):
     username: str
@@ -0,0 +1,108 @@
+from typing import Iterable, List, Optional, Tuple
+from datetime import datetime
+from fastapi import HTTPException
+from pymongo import ASCENDING, DESCENDING
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+Cursor = Tuple[Optional[datetime], str]
+
+
+def encode_cursor(doc: dict) -> str:
+    created_at = doc.get('createdAt')
+    raw = json.dumps([created_at.isoformat() if created_at else None, doc['id']])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        if created_at is not None:
+            created_at = datetime.fromisoformat(created_at)
+        return created_at, str(last_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(cursor: Cursor, direction: int) -> dict:
+    """Filter selecting documents strictly after ``cursor`` in (createdAt, id) order.
+
+    Documents without ``createdAt`` sort before every dated document, as
+    MongoDB orders missing fields like null.
+    """
+    created_at, last_id = cursor
+    op = '$gt' if direction == ASCENDING else '$lt'
+    if created_at is None:
+        same_key = {'createdAt': None, 'id': {op: last_id}}
+        if direction == ASCENDING:
+            return {'$or': [same_key, {'createdAt': {'$ne': None}}]}
+        return same_key
+    clauses = [
+        {'createdAt': {op: created_at}},
+        {'createdAt': created_at, 'id': {op: last_id}},
+    ]
+    if direction == DESCENDING:
+        clauses.append({'createdAt': None})
+    return {'$or': clauses}
+
+
+def keyset_sort(direction: int) -> list:
+    return [('createdAt', direction), ('id', direction)]
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[dict]:
+    """Turn ``fields=a,b`` into a Mongo projection; the cursor keys are always kept."""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(',') if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    projection = {'_id': 0, 'id': 1, 'createdAt': 1}
+    projection.update({name: 1 for name in requested})
+    return projection
+
+
+async def fetch_page(collection, query: dict, direction: int, limit: int,
+                     after: Optional[str] = None,
+                     projection: Optional[dict] = None,
+                     max_time_ms: Optional[int] = None) -> Tuple[List[dict], Optional[str]]:
+    """Run a keyset-paginated query and return the page plus the next cursor."""
+    if after:
+        query = {'$and': [query, keyset_filter(decode_cursor(after), direction)]}
+    cursor = collection.find(query, projection or {'_id': 0}, max_time_ms=max_time_ms)
+    docs = await cursor.sort(keyset_sort(direction)).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
+
+
+def keyset_key(doc: dict) -> tuple:
+    """Python sort key matching ``keyset_sort``; missing ``createdAt`` sorts first."""
+    created_at = doc.get('createdAt')
+    return created_at is not None, created_at or datetime.min, doc['id']
+
+
+def page_documents(docs: List[dict], direction: int, limit: int,
+                   after: Optional[str] = None,
+                   projection: Optional[dict] = None) -> Tuple[List[dict], Optional[str]]:
+    """``fetch_page`` over documents already in memory."""
+    reverse = direction == DESCENDING
+    ordered = sorted(docs, key=keyset_key, reverse=reverse)
+    if after:
+        created_at, last_id = decode_cursor(after)
+        start = keyset_key({'createdAt': created_at, 'id': last_id})
+        ordered = [doc for doc in ordered if (keyset_key(doc) < start if reverse else keyset_key(doc) > start)]
+    page = ordered[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(ordered) > limit else None
+    if projection:
+        fields = [name for name, include in projection.items() if include and name != '_id']
+        page = [{name: doc[name] for name in fields if name in doc} for doc in page]
+    return page, next_cursor
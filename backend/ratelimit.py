@@ -0,0 +1,154 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+from starlette.types import ASGIApp, Receive, Scope, Send
+import json
+import logging
+import math
+import os
+import time
+
+# Rate limit configuration: bucket capacity and refill window per route
+CONTACT_RATE_LIMIT = int(os.environ.get('CONTACT_RATE_LIMIT', '5'))
+CONTACT_RATE_WINDOW_SECONDS = float(os.environ.get('CONTACT_RATE_WINDOW_SECONDS', '60'))
+LOGIN_RATE_LIMIT = int(os.environ.get('LOGIN_RATE_LIMIT', '10'))
+LOGIN_RATE_WINDOW_SECONDS = float(os.environ.get('LOGIN_RATE_WINDOW_SECONDS', '300'))
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000'))
+# Honour X-Forwarded-For only when running behind a trusted proxy
+RATE_LIMIT_TRUST_PROXY = os.environ.get('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true'
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBucketStore:
+    """Per-process token bucket state, bounded by evicting the least recently used keys."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, window: float, now: float) -> float:
+        """Consume one token; returns 0 on success or the seconds until one is available."""
+        rate = capacity / window
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        # Refilling continuously makes the bucket behave as a sliding window
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            retry_after = 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            retry_after = (1 - tokens) / rate
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class MongoBucketStore:
+    """Token buckets shared between workers through a MongoDB collection.
+
+    Each take is a single atomic ``find_one_and_update`` using an
+    aggregation pipeline, so concurrent workers never double-spend.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def take(self, key: str, capacity: int, window: float, now: float) -> float:
+        rate = capacity / window
+        refilled = {'$min': [capacity, {'$add': [
+            {'$ifNull': ['$tokens', capacity]},
+            {'$multiply': [{'$subtract': [now, {'$ifNull': ['$updated', now]}]}, rate]},
+        ]}]}
+        doc = await self.collection.find_one_and_update(
+            {'_id': key},
+            [
+                {'$set': {'tokens': refilled, 'updated': now}},
+                {'$set': {
+                    'allowed': {'$gte': ['$tokens', 1]},
+                    'tokens': {'$cond': [{'$gte': ['$tokens', 1]}, {'$subtract': ['$tokens', 1]}, '$tokens']},
+                    'expiresAt': {'$toDate': {'$multiply': [now + window, 1000]}},
+                }},
+            ],
+            upsert=True,
+            return_document=True,
+        )
+        if doc['allowed']:
+            return 0.0
+        return (1 - doc['tokens']) / rate
+
+
+class RateLimiter:
+    def __init__(self, store=None):
+        self.store = store or MemoryBucketStore()
+        self.limited = 0
+
+    async def hit(self, key: str, capacity: int, window: float) -> float:
+        try:
+            retry_after = await self.store.take(key, capacity, window, time.time())
+        except Exception as e:
+            # Fail open: a broken shared store must not take the routes down
+            logger.warning(f"Rate limit store unavailable: {e}")
+            return 0.0
+        if retry_after:
+            self.limited += 1
+        return retry_after
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def client_ip(scope: Scope) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        for name, value in scope.get('headers', ()):
+            if name == b'x-forwarded-for':
+                return value.decode('latin-1').split(',')[0].strip()
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-IP token buckets to selected routes.
+
+    ``rules`` maps ``(method, path)`` to ``(capacity, window_seconds)``.
+    Other requests pass straight through after a single dict lookup.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter,
+                 rules: Dict[Tuple[str, str], Tuple[int, float]]):
+        self.app = app
+        self.limiter = limiter
+        self.rules = rules
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        rule = self.rules.get((scope['method'], scope['path']))
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+        capacity, window = rule
+        retry_after = await self.limiter.hit(f"ip:{scope['path']}:{client_ip(scope)}", capacity, window)
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+        body = json.dumps({'detail': 'Too many requests'}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 429,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', retry_after_header(retry_after).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def build_limiter(db=None) -> RateLimiter:
+    """Memory-backed by default; RATE_LIMIT_BACKEND=mongo shares buckets across workers."""
+    if os.environ.get('RATE_LIMIT_BACKEND', 'memory').lower() == 'mongo' and db is not None:
+        return RateLimiter(MongoBucketStore(db.rate_limits))
+    return RateLimiter()
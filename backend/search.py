@@ -0,0 +1,126 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Searchable fields and their weights per document type
+FIELD_WEIGHTS = {
+    'service': {'category': 3.0, 'features': 2.0, 'description': 1.5, 'detailedContent': 1.0},
+    'project': {'title': 3.0, 'technologies': 2.0, 'description': 1.5},
+}
+TITLE_FIELDS = {'service': 'category', 'project': 'title'}
+
+# A prefix match counts for less than an exact term match
+PREFIX_FACTOR = 0.5
+MIN_PREFIX_LENGTH = 2
+
+DocKey = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """In-memory inverted index over services and projects.
+
+    Postings map each term to the weighted frequency of that term per
+    document. A sorted term list, rebuilt lazily after changes, answers
+    prefix lookups with a binary search.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[DocKey, float]] = {}
+        self._doc_terms: Dict[DocKey, List[str]] = {}
+        self._summaries: Dict[DocKey, dict] = {}
+        self._sorted_terms: Optional[List[str]] = None
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def rebuild(self, services: Iterable[dict], projects: Iterable[dict]):
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._summaries.clear()
+        for service in services:
+            self.add('service', service)
+        for project in projects:
+            self.add('project', project)
+
+    def add(self, kind: str, doc: dict):
+        key = (kind, doc['id'])
+        self.remove(kind, doc['id'])
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS[kind].items():
+            value = doc.get(field)
+            if not value:
+                continue
+            text = ' '.join(value) if isinstance(value, list) else str(value)
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + weight
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[key] = weight
+        self._doc_terms[key] = list(weights)
+        self._summaries[key] = {
+            'type': kind,
+            'id': doc['id'],
+            'title': doc.get(TITLE_FIELDS[kind], ''),
+            'description': doc.get('description', ''),
+        }
+        self._sorted_terms = None
+
+    def remove(self, kind: str, doc_id: str):
+        key = (kind, doc_id)
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+        self._summaries.pop(key, None)
+        self._sorted_terms = None
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        # Every term starting with prefix sorts between prefix and prefix + the highest code point
+        return terms[bisect_left(terms, prefix):bisect_right(terms, prefix + '\U0010ffff')]
+
+    def _score_token(self, token: str) -> Dict[DocKey, float]:
+        scores = dict(self._postings.get(token, {}))
+        if len(token) < MIN_PREFIX_LENGTH:
+            return scores
+        for term in self._prefix_terms(token):
+            if term == token:
+                continue
+            for key, weight in self._postings[term].items():
+                scores[key] = scores.get(key, 0.0) + weight * PREFIX_FACTOR
+        return scores
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[dict]:
+        """Rank documents matching every query token (exactly or by prefix)."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        totals: Optional[Dict[DocKey, float]] = None
+        for token in dict.fromkeys(tokens):
+            scores = self._score_token(token)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {key: totals[key] + score for key, score in scores.items() if key in totals}
+            if not totals:
+                return []
+        if kind is not None:
+            totals = {key: score for key, score in totals.items() if key[0] == kind}
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [dict(self._summaries[key], score=round(score, 3)) for key, score in ranked]
+
+
+search_index = SearchIndex()
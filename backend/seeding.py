@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+import asyncio
+import logging
+import os
+import socket
+
+# Bump when seed_data.py gains documents that existing clusters should receive
+SEED_VERSION = 1
+# A worker that dies mid-seed releases the lock after this long
+SEED_LOCK_SECONDS = int(os.environ.get('SEED_LOCK_SECONDS', '60'))
+SEED_WAIT_POLL_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _upserts(docs, key: str):
+    # $setOnInsert never overwrites documents an admin has since edited
+    return [UpdateOne({key: doc[key]}, {'$setOnInsert': doc}, upsert=True) for doc in docs]
+
+
+async def _seed_admin(db, hash_password):
+    if await db.admin_users.find_one({'username': 'admin'}, {'_id': 1}):
+        return
+    hashed_password = await hash_password('admin')
+    result = await db.admin_users.update_one(
+        {'username': 'admin'},
+        {'$setOnInsert': {'username': 'admin', 'hashedPassword': hashed_password}},
+        upsert=True
+    )
+    if result.upserted_id is not None:
+        logger.info('Admin user created')
+
+
+async def _seed_company(db, company):
+    result = await db.company_info.update_one({}, {'$setOnInsert': company}, upsert=True)
+    if result.upserted_id is not None:
+        logger.info('Company info seeded')
+
+
+async def _seed_collection(collection, docs, key: str, only_if_empty: bool = False):
+    if only_if_empty and await collection.find_one({}, {'_id': 1}):
+        return
+    result = await collection.bulk_write(_upserts(docs, key), ordered=False)
+    if result.upserted_count:
+        logger.info(f'{collection.name}: seeded {result.upserted_count} documents')
+
+
+async def _acquire_lock(state) -> bool:
+    now = datetime.utcnow()
+    try:
+        await state.update_one(
+            {
+                '_id': 'seed',
+                'version': {'$not': {'$gte': SEED_VERSION}},
+                'lockedUntil': {'$not': {'$gt': now}},
+            },
+            {'$set': {
+                'lockedBy': WORKER_ID,
+                'lockedUntil': now + timedelta(seconds=SEED_LOCK_SECONDS),
+            }},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The document exists but is either seeded already or locked by another worker
+        return False
+    lock = await state.find_one({'_id': 'seed'})
+    return lock is not None and lock.get('lockedBy') == WORKER_ID
+
+
+async def seed_database(db, hash_password) -> bool:
+    """Seed the database once per cluster; returns True if this worker did the seeding.
+
+    The ``seed_state`` document records the seeded SEED_VERSION, so later
+    boots cost a single ``find_one`` and seed documents an admin deleted
+    are not recreated. Concurrent workers wait for the lock holder.
+
+    Databases without a recorded version (fresh, or seeded before
+    ``seed_state`` existed) only have empty collections seeded, since
+    missing seed documents there may have been deleted on purpose.
+    """
+    state = db.seed_state
+    while True:
+        done = await state.find_one({'_id': 'seed'}, {'version': 1})
+        if done and done.get('version', 0) >= SEED_VERSION:
+            return False
+        unversioned = not (done and done.get('version'))
+        if await _acquire_lock(state):
+            break
+        await asyncio.sleep(SEED_WAIT_POLL_SECONDS)
+
+    try:
+        from seed_data import company_info_seed, services_seed, projects_seed
+
+        await asyncio.gather(
+            _seed_admin(db, hash_password),
+            _seed_company(db, company_info_seed),
+            _seed_collection(db.services, services_seed, 'id', only_if_empty=unversioned),
+            _seed_collection(db.projects, projects_seed, 'id', only_if_empty=unversioned),
+        )
+    except Exception:
+        await state.update_one(
+            {'_id': 'seed', 'lockedBy': WORKER_ID}, {'$unset': {'lockedBy': '', 'lockedUntil': ''}}
+        )
+        raise
+    await state.update_one(
+        {'_id': 'seed'},
+        {'$set': {'version': SEED_VERSION, 'seededAt': datetime.utcnow()},
+         '$unset': {'lockedBy': '', 'lockedUntil': ''}}
+    )
+    return True
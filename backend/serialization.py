@@ -0,0 +1,57 @@
+from typing import Any, Optional
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from starlette.responses import Response
+import os
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+# Serialize documents read from MongoDB as stored instead of validating them against
+# the response model again. Fields missing from older documents are then omitted
+# rather than filled with their defaults.
+TRUSTED_READS = os.environ.get('TRUSTED_READS', 'false').lower() == 'true'
+
+
+def dumps(value: Any) -> bytes:
+    """JSON bytes for plain data (dicts, lists, datetimes) without a jsonable_encoder pass."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return to_json(value, fallback=str)
+
+
+def document_projection(model: type) -> dict:
+    """Projection returning only ``model``'s fields, so trusted documents carry nothing extra."""
+    projection = {name: 1 for name in model.model_fields}
+    projection['_id'] = 0
+    return projection
+
+
+def dump_documents(adapter: TypeAdapter, data, trusted: bool = False) -> bytes:
+    """Serialize documents in the shape of ``adapter``.
+
+    Validation runs in pydantic-core and is cheaper than ``model_construct``,
+    so untrusted documents are validated rather than constructed.
+    """
+    if trusted and TRUSTED_READS:
+        return dumps(data)
+    return adapter.dump_json(adapter.validate_python(data))
+
+
+class FastJSONResponse(Response):
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(adapter: TypeAdapter, value, status_code: int = 200,
+                   headers: Optional[dict] = None, documents: bool = False) -> Response:
+    """Response serialized straight to JSON bytes, bypassing FastAPI's response_model pass.
+
+    ``value`` is a model instance, or MongoDB documents when ``documents`` is set.
+    """
+    body = dump_documents(adapter, value, trusted=True) if documents else adapter.dump_json(value)
+    return Response(body, status_code=status_code, media_type='application/json', headers=headers)
@@ -1,37 +1,91 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import (
+    FastAPI, APIRouter, HTTPException, Depends, File, Header, Query, Response, UploadFile, status
+)
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, InsertOne, UpdateOne, DeleteOne, ReturnDocument
+from pymongo.errors import (
+    BulkWriteError, ConnectionFailure, DuplicateKeyError, ExecutionTimeout, ServerSelectionTimeoutError
+)
+from starlette.concurrency import run_in_threadpool
 import os
+import asyncio
+import hashlib
 import logging
+import time
 from pathlib import Path
-from typing import List
-from datetime import timedelta
+from typing import List, Literal, Optional
+from datetime import datetime, timedelta
+from pydantic import TypeAdapter
+
+ROOT_DIR = Path(__file__).parent
+# Loaded before the local modules below, which read their settings at import time
+load_dotenv(ROOT_DIR / '.env')
 
 from models import (
     CompanyInfo, CompanyInfoUpdate,
     Service, ServiceCreate, ServiceUpdate,
     Project, ProjectCreate, ProjectUpdate,
-    ContactMessage, ContactMessageCreate,
+    ContactMessage, ContactMessageCreate, QuarantinedMessage,
+    ServiceBulkRequest, ProjectBulkRequest, BulkResult, SearchHit, SiteBootstrap,
+    MessageBulkAction, MessageBulkResult, MediaAsset, AuditEntry,
     AdminLogin, Token
 )
 from auth import (
-    verify_password, get_password_hash, create_access_token, verify_token,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    verify_and_update_password, hash_password, create_access_token, verify_token,
+    password_pool, token_cache, PasswordPoolSaturated, ACCESS_TOKEN_EXPIRE_MINUTES
+)
+from cache import catalog_cache, CachedResponse, CachePolicyMiddleware
+from compression import CompressionMiddleware, COMPRESSION_ENABLED
+from sync import CatalogWatcher
+from indexes import ensure_indexes, query_monitor
+from ingest import (
+    BatchWriter, WriterOverloaded, CONTACT_INGEST_MODE, CONTACT_BATCH_SIZE,
+    CONTACT_BATCH_DELAY_MS, CONTACT_QUEUE_SIZE, CONTACT_ENQUEUE_TIMEOUT_MS, CONTACT_SPILL_PATH
+)
+from export import MEDIA_TYPES, export_cursor, stream_csv, stream_ndjson
+from search import search_index
+from ratelimit import (
+    RateLimitMiddleware, build_limiter, retry_after_header, CONTACT_RATE_LIMIT,
+    CONTACT_RATE_WINDOW_SECONDS, LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW_SECONDS
+)
+from metrics import MetricsMiddleware, metrics, METRICS_ENABLED
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page, parse_fields
+from database import (
+    client_options, public_database, pool_monitor,
+    PUBLIC_QUERY_TIMEOUT_MS, ADMIN_QUERY_TIMEOUT_MS
+)
+from health import InFlightMiddleware, lifecycle
+from serialization import FastJSONResponse, document_projection, model_response
+from media import (
+    MediaPipeline, build_media_store, content_type_for, media_url, parse_range,
+    MEDIA_CACHE_CONTROL, MEDIA_KEY_PATTERN, MEDIA_MAX_UPLOAD_BYTES, MEDIA_URL_PREFIX, UPLOAD_TYPES
+)
+from seeding import seed_database
+from audit import AuditLog, AUDIT_DELETE_BATCH_SIZE, AUDIT_ENTITIES
+from spam import spam_filter, Verdict, SPAM_FILTER_ENABLED
+from snapshot import (
+    CatalogSnapshot, SnapshotError, catalog_checksum, load_snapshot, write_snapshot,
+    CATALOG_SOURCE, SNAPSHOT_FALLBACK_SECONDS, SNAPSHOT_PATH
 )
-from seed_data import company_info_seed, services_seed, projects_seed
-
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url, event_listeners=[query_monitor, pool_monitor], **client_options()
+)
 db = client[os.environ['DB_NAME']]
+# Public catalog reads may be routed to secondaries (MONGO_PUBLIC_READ_PREFERENCE)
+public_db = public_database(client, os.environ['DB_NAME'])
 
 # Create the main app without a prefix
 app = FastAPI()
 
+# Per-IP and per-username throttling for abuse-prone routes
+rate_limiter = build_limiter(db)
+
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
@@ -42,41 +96,345 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Seed database on startup
+# Write-behind queue for contact messages (CONTACT_INGEST_MODE=batched)
+contact_writer = BatchWriter(
+    db.contact_messages,
+    batch_size=CONTACT_BATCH_SIZE,
+    max_delay=CONTACT_BATCH_DELAY_MS / 1000,
+    max_pending=CONTACT_QUEUE_SIZE,
+    enqueue_timeout=CONTACT_ENQUEUE_TIMEOUT_MS / 1000,
+    spill_path=CONTACT_SPILL_PATH,
+)
+
+# Change history of admin writes, written in batches
+audit_log = AuditLog(db.audit_log)
+
+# Uploaded images and their variants (MEDIA_STORE, MEDIA_ROOT)
+media_store = build_media_store()
+media_pipeline = MediaPipeline(media_store)
+
+# Index provisioning, seeding and cache warming run in the background so
+# the worker accepts connections immediately; /readyz reports when they finish
+index_task = None
+boot_task = None
+
+# Retry delay while seeding cannot reach the database
+SEED_RETRY_SECONDS = 5
+
+async def seed_and_warm():
+    while True:
+        try:
+            if await seed_database(db, hash_password):
+                logger.info("Database initialized successfully")
+            lifecycle.seeded = True
+            break
+        except Exception as e:
+            logger.error(f"Error during database initialization, retrying in {SEED_RETRY_SECONDS}s: {e}")
+        await asyncio.sleep(SEED_RETRY_SECONDS)
+    while True:
+        if await refresh_catalog():
+            return
+        await asyncio.sleep(SEED_RETRY_SECONDS)
+
 @app.on_event("startup")
 async def startup_db():
+    global index_task, boot_task
+    index_task = asyncio.create_task(ensure_indexes(db))
+    lifecycle.index_task = index_task
+    lifecycle.install_signal_handler()
+    await warm_from_snapshot()
+    boot_task = asyncio.create_task(seed_and_warm())
+
+    catalog_watcher.start()
+    audit_log.start()
+    if CONTACT_INGEST_MODE == "batched":
+        contact_writer.start()
+
+# ============ CATALOG CACHE ============
+
+company_adapter = TypeAdapter(CompanyInfo)
+service_adapter = TypeAdapter(Service)
+services_adapter = TypeAdapter(List[Service])
+project_adapter = TypeAdapter(Project)
+projects_adapter = TypeAdapter(List[Project])
+partial_adapter = TypeAdapter(List[dict])
+site_adapter = TypeAdapter(SiteBootstrap)
+message_adapter = TypeAdapter(ContactMessage)
+messages_adapter = TypeAdapter(List[ContactMessage])
+audit_adapter = TypeAdapter(List[AuditEntry])
+quarantine_adapter = TypeAdapter(List[QuarantinedMessage])
+partial_site_adapter = TypeAdapter(dict)
+
+# Background task re-rendering the catalog after an invalidation
+refresh_task = None
+# Set when the search index may have missed changes and must be rebuilt on the next warm
+search_stale = True
+# Catalog snapshot last written or loaded (SNAPSHOT_PATH); public reads fall back to it
+catalog_snapshot: Optional[CatalogSnapshot] = None
+snapshot_fallbacks = 0
+# Public reads skip MongoDB until then after a failed read
+mongo_retry_at = 0.0
+
+async def read_catalog(from_mongo, from_snapshot, snapshot: Optional[CatalogSnapshot] = None):
+    """Run a public read against MongoDB, or against the snapshot when MongoDB is unavailable.
+
+    ``snapshot`` forces the read onto that snapshot; with CATALOG_SOURCE=snapshot
+    every read uses the current one.
+    """
+    global snapshot_fallbacks, mongo_retry_at
+    if snapshot is not None:
+        return from_snapshot(snapshot)
+    snapshot = catalog_snapshot
+    if snapshot is not None and (CATALOG_SOURCE == "snapshot" or time.monotonic() < mongo_retry_at):
+        return from_snapshot(snapshot)
     try:
-        # Seed admin user if not exists
-        admin_user = await db.admin_users.find_one({"username": "admin"})
-        if not admin_user:
-            hashed_password = get_password_hash("admin")
-            await db.admin_users.insert_one({
-                "username": "admin",
-                "hashedPassword": hashed_password
-            })
-            logger.info("Admin user created")
-        
-        # Seed company info if not exists
-        company = await db.company_info.find_one()
-        if not company:
-            await db.company_info.insert_one(company_info_seed)
-            logger.info("Company info seeded")
-        
-        # Seed services if not exists
-        services_count = await db.services.count_documents({})
-        if services_count == 0:
-            await db.services.insert_many(services_seed)
-            logger.info("Services seeded")
-        
-        # Seed projects if not exists
-        projects_count = await db.projects.count_documents({})
-        if projects_count == 0:
-            await db.projects.insert_many(projects_seed)
-            logger.info("Projects seeded")
-        
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Error during database initialization: {e}")
+        return await from_mongo()
+    except (ConnectionFailure, ExecutionTimeout) as e:
+        if snapshot is None:
+            raise
+        snapshot_fallbacks += 1
+        mongo_retry_at = time.monotonic() + SNAPSHOT_FALLBACK_SECONDS
+        logger.warning(f"Serving the catalog from snapshot v{snapshot.version}: {e}")
+        return from_snapshot(snapshot)
+
+# Only model fields are read, so stored documents can be served without re-validation
+COMPANY_PROJECTION = document_projection(CompanyInfo)
+SERVICE_PROJECTION = document_projection(Service)
+PROJECT_PROJECTION = document_projection(Project)
+MESSAGE_PROJECTION = document_projection(ContactMessage)
+
+def version_etag(document: dict) -> str:
+    """ETag of a single versioned document; PUT accepts it back as If-Match."""
+    return f'"{document.get("version", 0)}"'
+
+def document_entry(adapter, document: dict) -> CachedResponse:
+    return CachedResponse.render(adapter, document, trusted=True, etag=version_etag(document))
+
+async def load_company():
+    company = await read_catalog(
+        lambda: public_db.company_info.find_one(
+            {}, COMPANY_PROJECTION, max_time_ms=PUBLIC_QUERY_TIMEOUT_MS
+        ),
+        lambda snapshot: snapshot.company,
+    )
+    if not company:
+        raise HTTPException(status_code=404, detail="Company info not found")
+    return document_entry(company_adapter, company)
+
+async def load_services():
+    services = await read_catalog(
+        lambda: public_db.services.find(
+            {}, SERVICE_PROJECTION, max_time_ms=PUBLIC_QUERY_TIMEOUT_MS
+        ).to_list(1000),
+        lambda snapshot: snapshot.services,
+    )
+    return CachedResponse.render(services_adapter, services, trusted=True)
+
+async def load_service(service_id: str):
+    service = await read_catalog(
+        lambda: public_db.services.find_one(
+            {"id": service_id}, SERVICE_PROJECTION, max_time_ms=PUBLIC_QUERY_TIMEOUT_MS
+        ),
+        lambda snapshot: snapshot.service(service_id),
+    )
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return document_entry(service_adapter, service)
+
+async def load_projects(limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+                        fields: Optional[str] = None, category: Optional[str] = None,
+                        year: Optional[str] = None,
+                        snapshot: Optional[CatalogSnapshot] = None):
+    query = {}
+    if category:
+        query["category"] = category
+    if year:
+        query["year"] = year
+    projection = parse_fields(fields, Project.model_fields)
+    projects, next_cursor = await read_catalog(
+        lambda: fetch_page(
+            public_db.projects, query, ASCENDING, limit, after, projection or PROJECT_PROJECTION,
+            max_time_ms=PUBLIC_QUERY_TIMEOUT_MS
+        ),
+        lambda snapshot: snapshot.projects_page(query, limit, after, projection),
+        snapshot,
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    # Partial documents cannot satisfy the Project model, so skip validation
+    if projection:
+        return CachedResponse.render(partial_adapter, projects, headers)
+    return CachedResponse.render(projects_adapter, projects, headers, trusted=True)
+
+async def load_project(project_id: str):
+    project = await read_catalog(
+        lambda: public_db.projects.find_one(
+            {"id": project_id}, PROJECT_PROJECTION, max_time_ms=PUBLIC_QUERY_TIMEOUT_MS
+        ),
+        lambda snapshot: snapshot.project(project_id),
+    )
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return document_entry(project_adapter, project)
+
+def site_projections(fields: Optional[str]):
+    """Split ``fields`` into service and project projections; each keeps only its own fields."""
+    projection = parse_fields(fields, set(Service.model_fields) | set(Project.model_fields))
+    if projection is None:
+        return None, None
+    service = {name: value for name, value in projection.items()
+               if name == "_id" or name in Service.model_fields}
+    project = {name: value for name, value in projection.items()
+               if name == "_id" or name in Project.model_fields}
+    return service, project
+
+async def load_site(fields: Optional[str] = None, snapshot: Optional[CatalogSnapshot] = None):
+    service_projection, project_projection = site_projections(fields)
+    company, services, (projects, next_cursor) = await read_catalog(
+        lambda: asyncio.gather(
+            public_db.company_info.find_one({}, COMPANY_PROJECTION, max_time_ms=PUBLIC_QUERY_TIMEOUT_MS),
+            public_db.services.find(
+                {}, service_projection or SERVICE_PROJECTION, max_time_ms=PUBLIC_QUERY_TIMEOUT_MS
+            ).to_list(1000),
+            fetch_page(public_db.projects, {}, ASCENDING, DEFAULT_PAGE_SIZE,
+                       projection=project_projection or PROJECT_PROJECTION,
+                       max_time_ms=PUBLIC_QUERY_TIMEOUT_MS),
+        ),
+        lambda snapshot: (
+            snapshot.company,
+            snapshot.services_page(service_projection),
+            snapshot.projects_page({}, DEFAULT_PAGE_SIZE, projection=project_projection),
+        ),
+        snapshot,
+    )
+    site = {
+        "company": company,
+        "services": services,
+        "projects": projects,
+        "projectsNextCursor": next_cursor,
+    }
+    if fields:
+        return CachedResponse.render(partial_site_adapter, site)
+    return CachedResponse.render(site_adapter, site, trusted=True)
+
+async def serve_cached(key, loader, if_none_match: Optional[str],
+                       accept_encoding: Optional[str] = None):
+    entry = catalog_cache.get(key)
+    if entry is None:
+        version = catalog_cache.version
+        entry = await loader()
+        catalog_cache.set(key, entry, version)
+    return entry.to_response(if_none_match, accept_encoding)
+
+async def warm_catalog():
+    """Read the catalog from MongoDB, snapshot it and pre-render every public response."""
+    global search_stale
+    version = catalog_cache.version
+    rebuild_search = search_stale
+    search_stale = False
+    company, services, projects = await asyncio.gather(
+        db.company_info.find_one({}, COMPANY_PROJECTION),
+        db.services.find({}, SERVICE_PROJECTION).to_list(1000),
+        db.projects.find({}, PROJECT_PROJECTION).to_list(None),
+    )
+    await save_snapshot(company, services, projects)
+    await render_catalog(version, company, services, projects, rebuild_search)
+
+async def save_snapshot(company, services, projects):
+    """Write a new catalog snapshot unless the catalog is unchanged since the last one."""
+    global catalog_snapshot
+    if not SNAPSHOT_PATH:
+        return
+    previous = catalog_snapshot
+    if previous is not None and previous.checksum == catalog_checksum(company, services, projects):
+        return
+    version = previous.version + 1 if previous else 1
+    loop = asyncio.get_running_loop()
+    try:
+        catalog_snapshot = await loop.run_in_executor(
+            None, write_snapshot, SNAPSHOT_PATH, version, company, services, projects
+        )
+    except OSError as e:
+        logger.error(f"Could not write catalog snapshot: {e}")
+        return
+    lifecycle.snapshot = version
+    logger.info(f"Wrote catalog snapshot v{version} to {SNAPSHOT_PATH}")
+
+async def warm_from_snapshot():
+    """Serve the catalog from the on-disk snapshot until MongoDB has been read."""
+    global catalog_snapshot
+    if not SNAPSHOT_PATH:
+        return
+    try:
+        snapshot = load_snapshot(SNAPSHOT_PATH)
+    except (OSError, SnapshotError, ValueError, KeyError) as e:
+        logger.error(f"Ignoring catalog snapshot: {e}")
+        return
+    if snapshot is None:
+        return
+    catalog_snapshot = snapshot
+    lifecycle.snapshot = snapshot.version
+    await render_catalog(
+        catalog_cache.version, snapshot.company, snapshot.services, snapshot.projects,
+        rebuild_search=True, snapshot=snapshot
+    )
+    logger.info(f"Serving catalog snapshot v{snapshot.version} written at {snapshot.created_at}")
+
+async def render_catalog(version: int, company, services, projects, rebuild_search: bool,
+                         snapshot: Optional[CatalogSnapshot] = None):
+    """Pre-render every public catalog response into the cache."""
+    projects_page, site = await asyncio.gather(
+        load_projects(snapshot=snapshot),
+        load_site(snapshot=snapshot),
+    )
+    if rebuild_search:
+        search_index.rebuild(services, projects)
+    if company:
+        catalog_cache.set("company", document_entry(company_adapter, company), version)
+    services_entry = CachedResponse.render(services_adapter, services, trusted=True)
+    # The list payloads are the large ones; compress them now rather than on first request
+    services_entry.precompress()
+    projects_page.precompress()
+    site.precompress()
+    catalog_cache.set("services", services_entry, version)
+    catalog_cache.set("projects", projects_page, version)
+    catalog_cache.set("site", site, version)
+    for service in services:
+        catalog_cache.set(("service", service["id"]), document_entry(service_adapter, service), version)
+    for project in projects:
+        catalog_cache.set(("project", project["id"]), document_entry(project_adapter, project), version)
+    lifecycle.catalog_warm = True
+
+async def refresh_catalog() -> bool:
+    # Repeat until no invalidation happened while we were warming
+    while True:
+        version = catalog_cache.version
+        try:
+            await warm_catalog()
+        except Exception as e:
+            logger.error(f"Error warming catalog cache: {e}")
+            global search_stale
+            search_stale = True
+            return False
+        if catalog_cache.version == version:
+            return True
+
+def invalidate_local_catalog(rebuild_search: bool = False):
+    global refresh_task, search_stale
+    if rebuild_search:
+        search_stale = True
+    catalog_cache.bump()
+    if refresh_task is None or refresh_task.done():
+        refresh_task = asyncio.create_task(refresh_catalog())
+
+async def invalidate_catalog(rebuild_search: bool = False):
+    invalidate_local_catalog(rebuild_search)
+    await catalog_watcher.publish()
+
+def on_remote_catalog_change():
+    # Another worker changed the catalog, so our search index is out of date too
+    invalidate_local_catalog(rebuild_search=True)
+
+catalog_watcher = CatalogWatcher(db, on_remote_catalog_change)
 
 # ============ PUBLIC ENDPOINTS ============
 
@@ -85,60 +443,415 @@ async def root():
     return {"message": "PT Navodaya Multi Solusi API"}
 
 @api_router.get("/company", response_model=CompanyInfo)
-async def get_company_info():
-    company = await db.company_info.find_one()
-    if not company:
-        raise HTTPException(status_code=404, detail="Company info not found")
-    company.pop('_id', None)
-    return company
+async def get_company_info(if_none_match: Optional[str] = Header(None),
+                           accept_encoding: Optional[str] = Header(None)):
+    return await serve_cached("company", load_company, if_none_match, accept_encoding)
 
 @api_router.get("/services", response_model=List[Service])
-async def get_services():
-    services = await db.services.find().to_list(1000)
-    for service in services:
-        service.pop('_id', None)
-    return services
+async def get_services(if_none_match: Optional[str] = Header(None),
+                       accept_encoding: Optional[str] = Header(None)):
+    return await serve_cached("services", load_services, if_none_match, accept_encoding)
 
 @api_router.get("/services/{service_id}", response_model=Service)
-async def get_service(service_id: str):
-    service = await db.services.find_one({"id": service_id})
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
-    service.pop('_id', None)
-    return service
+async def get_service(service_id: str, if_none_match: Optional[str] = Header(None),
+                      accept_encoding: Optional[str] = Header(None)):
+    return await serve_cached(
+        ("service", service_id), lambda: load_service(service_id), if_none_match, accept_encoding
+    )
 
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects():
-    projects = await db.projects.find().to_list(1000)
-    for project in projects:
-        project.pop('_id', None)
-    return projects
+async def get_projects(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    year: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    if (limit, after, fields, category, year) == (DEFAULT_PAGE_SIZE, None, None, None, None):
+        key = "projects"
+    else:
+        key = ("projects", limit, after, fields, category, year)
+    return await serve_cached(
+        key, lambda: load_projects(limit, after, fields, category, year),
+        if_none_match, accept_encoding
+    )
 
 @api_router.get("/projects/{project_id}", response_model=Project)
-async def get_project(project_id: str):
-    project = await db.projects.find_one({"id": project_id})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    project.pop('_id', None)
-    return project
+async def get_project(project_id: str, if_none_match: Optional[str] = Header(None),
+                      accept_encoding: Optional[str] = Header(None)):
+    return await serve_cached(
+        ("project", project_id), lambda: load_project(project_id), if_none_match, accept_encoding
+    )
+
+@api_router.get("/site", response_model=SiteBootstrap)
+async def get_site(
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """Company, services and the first page of projects in one response."""
+    key = ("site", fields) if fields else "site"
+    return await serve_cached(key, lambda: load_site(fields), if_none_match, accept_encoding)
+
+@api_router.get("/search", response_model=List[SearchHit])
+async def search_catalog(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    type: Optional[Literal["service", "project"]] = None
+):
+    return search_index.search(q, limit, type)
+
+async def merge_duplicate(verdict: Verdict) -> bool:
+    """Count a repeat on the message it repeats; False if that message is not stored."""
+    entry = verdict.entry
+    original = entry.document
+    now = datetime.utcnow()
+    if not entry.quarantined and contact_writer.holds(original):
+        # Still queued, so the count is written along with the message
+        original["duplicateCount"] = original.get("duplicateCount", 0) + 1
+        original["lastSeenAt"] = now
+        return True
+    # A message in a batch that is still being written matches nothing here,
+    # so the repeat is stored as a message of its own rather than lost
+    collection = db.contact_quarantine if entry.quarantined else db.contact_messages
+    result = await collection.update_one(
+        {"id": original["id"]}, {"$inc": {"duplicateCount": 1}, "$set": {"lastSeenAt": now}}
+    )
+    return result.matched_count > 0
+
+async def store_contact_message(document: dict, verdict: Optional[Verdict] = None):
+    if verdict is not None and verdict.entry.quarantined:
+        await db.contact_quarantine.insert_one(
+            {**document, "reason": verdict.entry.reason, "score": verdict.entry.score}
+        )
+    elif not contact_writer.running:
+        await db.contact_messages.insert_one(document)
+    else:
+        try:
+            await contact_writer.put(document)
+        except WriterOverloaded:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many messages right now, please try again",
+                headers={"Retry-After": "5"}
+            )
+    if verdict is not None:
+        # Only messages that were stored are compared against
+        spam_filter.remember(verdict, document)
 
 @api_router.post("/contact", response_model=ContactMessage)
 async def create_contact_message(message: ContactMessageCreate):
-    message_dict = message.dict()
-    contact_msg = ContactMessage(**message_dict)
-    await db.contact_messages.insert_one(contact_msg.dict())
-    return contact_msg
+    contact_msg = ContactMessage.model_validate(message.model_dump())
+    document = contact_msg.model_dump()
+    verdict = None
+    if SPAM_FILTER_ENABLED:
+        # Senders get the same answer whatever the verdict, so bots learn nothing
+        verdict = spam_filter.check(document)
+        if verdict.action == "drop":
+            return model_response(message_adapter, contact_msg)
+        if verdict.action == "merge":
+            if await merge_duplicate(verdict):
+                spam_filter.merged()
+                return model_response(message_adapter, contact_msg)
+            # The earlier copy failed to insert or was deleted, so keep this one instead
+    await store_contact_message(document, verdict)
+    return model_response(message_adapter, contact_msg)
+
+# ============ MEDIA ============
+
+async def image_variants_for(url: Optional[str]) -> Optional[list]:
+    """Variants of an uploaded image, or None for external URLs and unprocessed uploads."""
+    if not url or not url.startswith(MEDIA_URL_PREFIX + "/"):
+        return None
+    asset = await db.media_assets.find_one({"url": url}, {"_id": 0, "variants": 1})
+    return (asset or {}).get("variants") or None
+
+async def on_media_processed(digest: str, result: Optional[dict]):
+    if result is None:
+        await db.media_assets.update_one({"id": digest}, {"$set": {"status": "failed"}})
+        return
+    asset = await db.media_assets.find_one_and_update(
+        {"id": digest},
+        {"$set": {"status": "ready", "width": result["width"], "height": result["height"],
+                  "variants": result["variants"]}}
+    )
+    if asset is None:
+        # Deleted while it was being processed
+        return
+    variants = result["variants"] or None
+    # Point every document already using this image at its variants
+    projects, company = await asyncio.gather(
+        db.projects.update_many(
+            {"image": asset["url"]}, {"$set": {"imageVariants": variants}, "$inc": {"version": 1}}
+        ),
+        db.company_info.update_many(
+            {"logo": asset["url"]}, {"$set": {"logoVariants": variants}, "$inc": {"version": 1}}
+        ),
+    )
+    if projects.modified_count or company.modified_count:
+        await invalidate_catalog()
+
+@api_router.get("/media/{key:path}")
+async def get_media(
+    key: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None)
+):
+    if not MEDIA_KEY_PATTERN.match(key):
+        raise HTTPException(status_code=404, detail="Media not found")
+    size = await run_in_threadpool(media_store.size, key)
+    if size is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    headers = {
+        "Cache-Control": MEDIA_CACHE_CONTROL,
+        "ETag": '"%s"' % key.replace("/", "-"),
+        "Accept-Ranges": "bytes",
+    }
+    if if_none_match and headers["ETag"] in if_none_match:
+        return Response(status_code=304, headers=headers)
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        media_store.iter_range(key, start, end),
+        status_code=206 if byte_range else 200,
+        media_type=content_type_for(key),
+        headers=headers
+    )
+
+@api_router.post("/admin/media", response_model=MediaAsset, status_code=201)
+async def upload_media(
+    file: UploadFile = File(...),
+    target: Optional[str] = Query(None, pattern=r"^(logo|project:.+)$"),
+    username: str = Depends(verify_token)
+):
+    """Store an image and queue its variants; ``target`` also points the logo or a project at it."""
+    extension = UPLOAD_TYPES.get(file.content_type)
+    if extension is None:
+        raise HTTPException(
+            status_code=415, detail=f"Unsupported image type, expected one of: {', '.join(UPLOAD_TYPES)}"
+        )
+    data = await file.read(MEDIA_MAX_UPLOAD_BYTES + 1)
+    if len(data) > MEDIA_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    asset = await db.media_assets.find_one({"id": digest}, {"_id": 0})
+    if asset is None:
+        key = f"{digest}/original{extension}"
+        await run_in_threadpool(media_store.save, key, data)
+        asset = MediaAsset(id=digest, url=media_url(key), contentType=file.content_type, size=len(data))
+        try:
+            await db.media_assets.insert_one(asset.model_dump())
+            media_pipeline.submit(digest, key, on_media_processed)
+        except DuplicateKeyError:
+            # The same image was uploaded concurrently
+            pass
+        asset = await db.media_assets.find_one({"id": digest}, {"_id": 0})
+
+    if target:
+        variants = asset.get("variants") or None
+        if target == "logo":
+            entity, query = "company", {}
+            update_data = {"logo": asset["url"], "logoVariants": variants}
+        else:
+            entity, query = "project", {"id": target.split(":", 1)[1]}
+            update_data = {"image": asset["url"], "imageVariants": variants}
+        before = await db[AUDIT_ENTITIES[entity][0]].find_one_and_update(
+            query, {"$set": update_data, "$inc": {"version": 1}}, {"_id": 0}
+        )
+        if before is None:
+            raise HTTPException(status_code=404, detail="Upload target not found")
+        await audit_log.record(
+            username, entity, query.get("id"), "update", before, updated_document(before, update_data)
+        )
+        await invalidate_catalog()
+    return asset
+
+@api_router.get("/admin/media/{asset_id}", response_model=MediaAsset)
+async def get_media_asset(asset_id: str, username: str = Depends(verify_token)):
+    asset = await db.media_assets.find_one({"id": asset_id}, {"_id": 0})
+    if not asset:
+        raise HTTPException(status_code=404, detail="Media not found")
+    return asset
 
 # ============ ADMIN ENDPOINTS ============
 
+def parse_if_match(if_match: Optional[str]):
+    """Expected document version from If-Match: None without a precondition, "*" for any."""
+    if if_match is None:
+        return None
+    if if_match.strip() == "*":
+        return "*"
+    tag = if_match.split(",")[0].strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    # Compressed GET responses tag the version with their encoding, e.g. "3-br"
+    version = tag.strip('"').split("-")[0]
+    try:
+        return int(version)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED,
+                            detail="If-Match must be a document version")
+
+def version_condition(query: dict, expected: int) -> dict:
+    condition = dict(query)
+    # Documents written before versioning count as version 0
+    if expected:
+        condition["version"] = expected
+    else:
+        condition["$or"] = [{"version": 0}, {"version": {"$exists": False}}]
+    return condition
+
+def updated_document(before: dict, update_data: dict) -> dict:
+    """The document after ``$set: update_data`` and the version increment."""
+    return {**before, **update_data, "version": before.get("version", 0) + 1}
+
+async def update_versioned(collection, query: dict, update_data: dict, if_match: Optional[str],
+                           label: str, entity: str, actor: str) -> dict:
+    """Apply ``update_data`` atomically, log the change and return the updated document.
+
+    With If-Match the update only applies to the expected version, so a
+    concurrent edit makes it fail with 412 instead of being overwritten.
+    """
+    expected = parse_if_match(if_match)
+    condition = version_condition(query, expected) if isinstance(expected, int) else query
+    # The previous version gives the diff; the new one follows from the update itself
+    before = await collection.find_one_and_update(
+        condition,
+        {"$set": update_data, "$inc": {"version": 1}},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        current = None
+        if isinstance(expected, int):
+            current = await collection.find_one(query, {"_id": 0, "version": 1})
+        if current is None:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"{label} was modified by another request",
+            headers={"ETag": version_etag(current)}
+        )
+    before.pop("_id", None)
+    document = updated_document(before, update_data)
+    await audit_log.record(actor, entity, query.get("id"), "update", before, document)
+    return document
+
+def versioned_response(adapter, document: dict) -> Response:
+    return model_response(
+        adapter, adapter.validate_python(document), headers={"ETag": version_etag(document)}
+    )
+
+async def run_bulk(collection, model_cls, request, label: str, entity: str, actor: str) -> dict:
+    """Apply create/update/delete items as one unordered bulk_write."""
+    items = []
+    operations = []
+    rejected = []
+    # (before, after) of each operation, for the audit log
+    changes = []
+
+    lookup_ids = [item.id for item in request.update] + list(request.delete)
+    existing = {}
+    if lookup_ids:
+        async for doc in collection.find({"id": {"$in": lookup_ids}}, {"_id": 0}):
+            existing[doc["id"]] = doc
+
+    for item in request.create:
+        data = item.model_dump()
+        if "createdAt" in model_cls.model_fields:
+            data["createdAt"] = datetime.utcnow()
+        if "imageVariants" in model_cls.model_fields:
+            data["imageVariants"] = await image_variants_for(data["image"])
+        obj = model_cls.model_validate(data)
+        document = obj.model_dump()
+        items.append({"op": "create", "id": obj.id, "status": "created"})
+        operations.append(InsertOne(document))
+        changes.append((None, document))
+
+    for item in request.update:
+        update_data = item.model_dump(exclude={"id"}, exclude_none=True)
+        if not update_data:
+            rejected.append({"op": "update", "id": item.id, "status": "error", "detail": "No data to update"})
+        elif item.id not in existing:
+            rejected.append({"op": "update", "id": item.id, "status": "not_found", "detail": f"{label} not found"})
+        else:
+            if "image" in update_data and "imageVariants" in model_cls.model_fields:
+                update_data["imageVariants"] = await image_variants_for(update_data["image"])
+            items.append({"op": "update", "id": item.id, "status": "updated"})
+            operations.append(UpdateOne({"id": item.id}, {"$set": update_data, "$inc": {"version": 1}}))
+            changes.append((existing[item.id], updated_document(existing[item.id], update_data)))
+
+    for item_id in request.delete:
+        if item_id not in existing:
+            rejected.append({"op": "delete", "id": item_id, "status": "not_found", "detail": f"{label} not found"})
+        else:
+            items.append({"op": "delete", "id": item_id, "status": "deleted"})
+            operations.append(DeleteOne({"id": item_id}))
+            changes.append((existing[item_id], None))
+
+    if operations:
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                items[error["index"]].update(status="error", detail=error.get("errmsg"))
+
+    for item, (before, after) in zip(items, changes):
+        if item["status"] != "error":
+            await audit_log.record(actor, entity, item["id"], item["op"], before, after)
+
+    result = {"created": 0, "updated": 0, "deleted": 0, "failed": 0, "results": items + rejected}
+    for item in result["results"]:
+        if item["status"] in result:
+            result[item["status"]] += 1
+        else:
+            result["failed"] += 1
+    if result["created"] or result["updated"] or result["deleted"]:
+        await invalidate_catalog(rebuild_search=True)
+    return result
+
 @api_router.post("/admin/login", response_model=Token)
 async def admin_login(credentials: AdminLogin):
+    retry_after = await rate_limiter.hit(
+        f"user:{credentials.username}", LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW_SECONDS
+    )
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": retry_after_header(retry_after)}
+        )
     admin = await db.admin_users.find_one({"username": credentials.username})
-    if not admin or not verify_password(credentials.password, admin["hashedPassword"]):
+    valid, new_hash = False, None
+    if admin:
+        try:
+            valid, new_hash = await verify_and_update_password(
+                credentials.password, admin["hashedPassword"]
+            )
+        except PasswordPoolSaturated:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again shortly",
+                headers={"Retry-After": "1"}
+            )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
+    if new_hash:
+        # The configured bcrypt cost changed since this hash was created
+        await db.admin_users.update_one(
+            {"username": credentials.username}, {"$set": {"hashedPassword": new_hash}}
+        )
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -149,122 +862,465 @@ async def admin_login(credentials: AdminLogin):
 @api_router.put("/admin/company", response_model=CompanyInfo)
 async def update_company_info(
     company_update: CompanyInfoUpdate,
+    if_match: Optional[str] = Header(None),
     username: str = Depends(verify_token)
 ):
-    update_data = {k: v for k, v in company_update.dict().items() if v is not None}
+    update_data = company_update.model_dump(exclude_none=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No data to update")
+    if "logo" in update_data:
+        update_data["logoVariants"] = await image_variants_for(update_data["logo"])
     
-    result = await db.company_info.update_one({}, {"$set": update_data})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Company info not found")
-    
-    company = await db.company_info.find_one()
-    company.pop('_id', None)
-    return company
+    company = await update_versioned(
+        db.company_info, {}, update_data, if_match, "Company info", "company", username
+    )
+    await invalidate_catalog()
+    return versioned_response(company_adapter, company)
 
 @api_router.post("/admin/services", response_model=Service)
 async def create_service(
     service: ServiceCreate,
     username: str = Depends(verify_token)
 ):
-    service_obj = Service(**service.dict())
-    await db.services.insert_one(service_obj.dict())
-    return service_obj
+    service_obj = Service.model_validate(service.model_dump())
+    document = service_obj.model_dump()
+    await db.services.insert_one(document)
+    await audit_log.record(username, "service", service_obj.id, "create", after=document)
+    search_index.add("service", document)
+    await invalidate_catalog()
+    return model_response(service_adapter, service_obj)
 
 @api_router.put("/admin/services/{service_id}", response_model=Service)
 async def update_service(
     service_id: str,
     service_update: ServiceUpdate,
+    if_match: Optional[str] = Header(None),
     username: str = Depends(verify_token)
 ):
-    update_data = {k: v for k, v in service_update.dict().items() if v is not None}
+    update_data = service_update.model_dump(exclude_none=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No data to update")
     
-    result = await db.services.update_one({"id": service_id}, {"$set": update_data})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    service = await db.services.find_one({"id": service_id})
-    service.pop('_id', None)
-    return service
+    service = await update_versioned(
+        db.services, {"id": service_id}, update_data, if_match, "Service", "service", username
+    )
+    search_index.add("service", service)
+    await invalidate_catalog()
+    return versioned_response(service_adapter, service)
 
 @api_router.delete("/admin/services/{service_id}")
 async def delete_service(
     service_id: str,
     username: str = Depends(verify_token)
 ):
-    result = await db.services.delete_one({"id": service_id})
-    if result.deleted_count == 0:
+    service = await db.services.find_one_and_delete({"id": service_id}, {"_id": 0})
+    if service is None:
         raise HTTPException(status_code=404, detail="Service not found")
+    await audit_log.record(username, "service", service_id, "delete", before=service)
+    search_index.remove("service", service_id)
+    await invalidate_catalog()
     return {"message": "Service deleted successfully"}
 
+@api_router.post("/admin/services/bulk", response_model=BulkResult)
+async def bulk_services(
+    request: ServiceBulkRequest,
+    username: str = Depends(verify_token)
+):
+    return await run_bulk(db.services, Service, request, "Service", "service", username)
+
 @api_router.post("/admin/projects", response_model=Project)
 async def create_project(
     project: ProjectCreate,
     username: str = Depends(verify_token)
 ):
-    project_obj = Project(**project.dict())
-    await db.projects.insert_one(project_obj.dict())
-    return project_obj
+    project_obj = Project.model_validate(
+        {**project.model_dump(), "createdAt": datetime.utcnow(),
+         "imageVariants": await image_variants_for(project.image)}
+    )
+    document = project_obj.model_dump()
+    await db.projects.insert_one(document)
+    await audit_log.record(username, "project", project_obj.id, "create", after=document)
+    search_index.add("project", document)
+    await invalidate_catalog()
+    return model_response(project_adapter, project_obj)
 
 @api_router.put("/admin/projects/{project_id}", response_model=Project)
 async def update_project(
     project_id: str,
     project_update: ProjectUpdate,
+    if_match: Optional[str] = Header(None),
     username: str = Depends(verify_token)
 ):
-    update_data = {k: v for k, v in project_update.dict().items() if v is not None}
+    update_data = project_update.model_dump(exclude_none=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No data to update")
+    if "image" in update_data:
+        update_data["imageVariants"] = await image_variants_for(update_data["image"])
     
-    result = await db.projects.update_one({"id": project_id}, {"$set": update_data})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    project = await db.projects.find_one({"id": project_id})
-    project.pop('_id', None)
-    return project
+    project = await update_versioned(
+        db.projects, {"id": project_id}, update_data, if_match, "Project", "project", username
+    )
+    search_index.add("project", project)
+    await invalidate_catalog()
+    return versioned_response(project_adapter, project)
 
 @api_router.delete("/admin/projects/{project_id}")
 async def delete_project(
     project_id: str,
     username: str = Depends(verify_token)
 ):
-    result = await db.projects.delete_one({"id": project_id})
-    if result.deleted_count == 0:
+    project = await db.projects.find_one_and_delete({"id": project_id}, {"_id": 0})
+    if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
+    await audit_log.record(username, "project", project_id, "delete", before=project)
+    search_index.remove("project", project_id)
+    await invalidate_catalog()
     return {"message": "Project deleted successfully"}
 
+@api_router.post("/admin/projects/bulk", response_model=BulkResult)
+async def bulk_projects(
+    request: ProjectBulkRequest,
+    username: str = Depends(verify_token)
+):
+    return await run_bulk(db.projects, Project, request, "Project", "project", username)
+
 @api_router.get("/admin/messages", response_model=List[ContactMessage])
-async def get_contact_messages(username: str = Depends(verify_token)):
-    messages = await db.contact_messages.find().sort("createdAt", -1).to_list(1000)
-    for message in messages:
-        message.pop('_id', None)
-    return messages
+async def get_contact_messages(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    isRead: Optional[bool] = None,
+    username: str = Depends(verify_token)
+):
+    query = {}
+    if isRead is not None:
+        query["isRead"] = isRead
+    projection = parse_fields(fields, ContactMessage.model_fields)
+    messages, next_cursor = await fetch_page(
+        db.contact_messages, query, DESCENDING, limit, after, projection or MESSAGE_PROJECTION,
+        max_time_ms=ADMIN_QUERY_TIMEOUT_MS
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    if projection:
+        return FastJSONResponse(messages, headers=headers)
+    return model_response(messages_adapter, messages, headers=headers, documents=True)
+
+@api_router.post("/admin/messages/bulk", response_model=MessageBulkResult)
+async def bulk_contact_messages(
+    request: MessageBulkAction,
+    username: str = Depends(verify_token)
+):
+    query = {}
+    if request.ids is not None:
+        query["id"] = {"$in": request.ids}
+    if request.isRead is not None:
+        query["isRead"] = request.isRead
+    if request.email:
+        query["email"] = request.email
+    if request.before or request.after:
+        query["createdAt"] = {}
+        if request.before:
+            query["createdAt"]["$lt"] = request.before
+        if request.after:
+            query["createdAt"]["$gt"] = request.after
+    if not query:
+        raise HTTPException(status_code=400, detail="Specify ids or at least one filter")
+
+    if request.action == "delete":
+        # Delete in batches read from a cursor so each deletion can be logged and restored
+        # without holding the whole selection in memory
+        matched = deleted = 0
+        cursor = db.contact_messages.find(query, {"_id": 0}, batch_size=AUDIT_DELETE_BATCH_SIZE)
+        while batch := await cursor.to_list(AUDIT_DELETE_BATCH_SIZE):
+            result = await db.contact_messages.delete_many({"id": {"$in": [m["id"] for m in batch]}})
+            await audit_log.record_deletes(username, "message", batch)
+            matched += len(batch)
+            deleted += result.deleted_count
+        return {"action": request.action, "matched": matched, "affected": deleted}
+    is_read = request.action == "mark_read"
+    result = await db.contact_messages.update_many(query, {"$set": {"isRead": is_read}})
+    await audit_log.record(
+        username, "message", None, request.action,
+        changes={"isRead": {"to": is_read}},
+        filter=request.model_dump(exclude={"action"}, exclude_none=True),
+        count=result.modified_count,
+    )
+    return {"action": request.action, "matched": result.matched_count, "affected": result.modified_count}
 
 @api_router.delete("/admin/messages/{message_id}")
 async def delete_contact_message(
     message_id: str,
     username: str = Depends(verify_token)
 ):
-    result = await db.contact_messages.delete_one({"id": message_id})
-    if result.deleted_count == 0:
+    message = await db.contact_messages.find_one_and_delete({"id": message_id}, {"_id": 0})
+    if message is None:
         raise HTTPException(status_code=404, detail="Message not found")
+    await audit_log.record(username, "message", message_id, "delete", before=message)
     return {"message": "Contact message deleted successfully"}
 
+@api_router.get("/admin/audit", response_model=List[AuditEntry])
+async def get_audit_log(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    entity: Optional[Literal["company", "service", "project", "message"]] = None,
+    entityId: Optional[str] = None,
+    actor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    username: str = Depends(verify_token)
+):
+    query = {}
+    if entity:
+        query["entity"] = entity
+    if entityId is not None:
+        query["entityId"] = entityId
+    if actor:
+        query["actor"] = actor
+    if since or until:
+        query["createdAt"] = {}
+        if since:
+            query["createdAt"]["$gte"] = since
+        if until:
+            query["createdAt"]["$lt"] = until
+    # Include changes still waiting in the batch
+    await audit_log.flush()
+    entries, next_cursor = await fetch_page(
+        db.audit_log, query, DESCENDING, limit, after, max_time_ms=ADMIN_QUERY_TIMEOUT_MS
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return model_response(audit_adapter, entries, headers=headers, documents=True)
+
+@api_router.post("/admin/audit/{entry_id}/restore")
+async def restore_audit_entry(entry_id: str, username: str = Depends(verify_token)):
+    """Put the entity back as it was right after the entry, or right before it for a delete."""
+    entry = await audit_log.get(entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Audit entry not found")
+    entity = entry["entity"]
+    if entity not in AUDIT_ENTITIES or (entry["entityId"] is None and entity != "company"):
+        raise HTTPException(status_code=400, detail="This entry cannot be restored")
+    collection_name, key = AUDIT_ENTITIES[entity]
+    collection = db[collection_name]
+    query = {key: entry["entityId"]} if key else {}
+
+    current = await collection.find_one(query, {"_id": 0})
+    if entry["action"] == "delete":
+        target = dict(entry["document"])
+    else:
+        try:
+            target = await audit_log.state_after(entry, current)
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+    if target is None:
+        raise HTTPException(status_code=409, detail="Nothing to restore, the entry removed the document")
+
+    versioned = entity != "message"
+    if versioned:
+        target["version"] = (current or target).get("version", 0) + 1
+    conflict = HTTPException(status_code=409, detail="The document changed during the restore, try again")
+    if current is None:
+        try:
+            await collection.insert_one(dict(target))
+        except DuplicateKeyError:
+            raise conflict
+    else:
+        condition = version_condition(query, current.get("version", 0)) if versioned else query
+        result = await collection.replace_one(condition, target)
+        if result.matched_count == 0:
+            raise conflict
+    await audit_log.record(
+        username, entity, entry["entityId"], "restore", current, target, restoredFrom=entry_id
+    )
+
+    if entity in ("service", "project"):
+        search_index.add(entity, target)
+    if versioned:
+        await invalidate_catalog()
+    return FastJSONResponse(target, headers={"ETag": version_etag(target)} if versioned else None)
+
+@api_router.get("/admin/messages/quarantine", response_model=List[QuarantinedMessage])
+async def get_quarantined_messages(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    username: str = Depends(verify_token)
+):
+    messages, next_cursor = await fetch_page(
+        db.contact_quarantine, {}, DESCENDING, limit, after, max_time_ms=ADMIN_QUERY_TIMEOUT_MS
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return model_response(quarantine_adapter, messages, headers=headers, documents=True)
+
+@api_router.post("/admin/messages/quarantine/{message_id}/release", response_model=ContactMessage)
+async def release_quarantined_message(message_id: str, username: str = Depends(verify_token)):
+    """Move a message the spam filter held back into the inbox."""
+    quarantined = await db.contact_quarantine.find_one({"id": message_id}, {"_id": 0})
+    if quarantined is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    message = ContactMessage.model_validate(quarantined)
+    document = message.model_dump()
+    try:
+        await db.contact_messages.insert_one(document)
+    except DuplicateKeyError:
+        # Released before by a request that failed to clean up
+        pass
+    await db.contact_quarantine.delete_one({"id": message_id})
+    spam_filter.release(document)
+    await audit_log.record(username, "message", message_id, "release", after=document)
+    return model_response(message_adapter, message)
+
+@api_router.get("/admin/stats")
+async def get_stats(username: str = Depends(verify_token)):
+    return {
+        "cache": catalog_cache.stats(),
+        "sync": catalog_watcher.stats(),
+        "passwordPool": password_pool.stats(),
+        "tokens": token_cache.stats(),
+        "contactIngest": contact_writer.stats(),
+        "rateLimited": rate_limiter.limited,
+        "mongoPool": pool_monitor.stats(),
+        "media": media_pipeline.stats(),
+        "audit": audit_log.stats(),
+        "spam": spam_filter.stats(),
+        "snapshot": {
+            "source": CATALOG_SOURCE,
+            "path": SNAPSHOT_PATH or None,
+            "fallbacks": snapshot_fallbacks,
+            **(catalog_snapshot.stats() if catalog_snapshot else {}),
+        },
+    }
+
+EXPORTS = {
+    "messages": ("contact_messages", ContactMessage),
+    "services": ("services", Service),
+    "projects": ("projects", Project),
+}
+
+@api_router.get("/admin/export/{collection}")
+async def export_collection(
+    collection: Literal["messages", "services", "projects"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    after: Optional[str] = None,
+    username: str = Depends(verify_token)
+):
+    collection_name, model = EXPORTS[collection]
+    cursor = export_cursor(db[collection_name], after)
+    if format == "csv":
+        body = stream_csv(cursor, list(model.model_fields))
+    else:
+        body = stream_ndjson(cursor)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{collection}.{format}"'}
+    )
+
+# ============ METRICS ============
+
+query_monitor.observer = metrics.observe_mongo
+
+def collect_runtime_metrics():
+    yield ("catalog_cache_requests_total", "counter", "Catalog cache lookups by result",
+           [('result="hit"', catalog_cache.hits), ('result="miss"', catalog_cache.misses)])
+    yield ("catalog_cache_entries", "gauge", "Entries held by the catalog cache",
+           [("", len(catalog_cache))])
+    yield ("token_cache_requests_total", "counter", "Verified-token cache lookups by result",
+           [('result="hit"', token_cache.hits), ('result="miss"', token_cache.misses)])
+    yield ("jwt_verifications_total", "counter", "JWT signature verifications (token cache misses)",
+           [("", token_cache.verifications)])
+    yield ("jwt_verify_seconds_total", "counter", "Time spent verifying JWT signatures",
+           [("", token_cache.verify_seconds)])
+    yield ("password_hash_operations_total", "counter", "bcrypt hash and verify operations",
+           [("", password_pool.completed)])
+    yield ("password_hash_seconds_total", "counter", "Time spent in bcrypt hashing and verification",
+           [("", password_pool.total_seconds)])
+    yield ("password_pool_queue_depth", "gauge", "bcrypt jobs running or waiting",
+           [("", password_pool.depth)])
+    yield ("password_pool_rejected_total", "counter", "bcrypt jobs rejected because the pool was full",
+           [("", password_pool.rejected)])
+    yield ("rate_limited_requests_total", "counter", "Requests rejected by the rate limiter",
+           [("", rate_limiter.limited)])
+    yield ("mongo_pool_connections", "gauge", "MongoDB connections by state",
+           [('state="open"', pool_monitor.open), ('state="in_use"', pool_monitor.in_use)])
+    yield ("mongo_pool_checkout_failures_total", "counter", "Failed connection checkouts",
+           [("", pool_monitor.checkout_failures)])
+    yield ("slow_queries_total", "counter", "MongoDB commands over the latency budget",
+           [("", query_monitor.slow_queries)])
+    yield ("contact_messages_filtered_total", "counter", "Contact messages by spam filter outcome",
+           [(f'outcome="{outcome}"', count) for outcome, count in spam_filter.counts.items()])
+    yield ("worker_draining", "gauge", "1 while the worker is shutting down",
+           [("", int(lifecycle.draining))])
+
+metrics.collectors.append(collect_runtime_metrics)
+
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def get_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# ============ HEALTH ============
+
+@app.get("/healthz", include_in_schema=False)
+async def liveness():
+    """Process is up and the event loop is responsive; never touches MongoDB."""
+    return {"status": "ok"}
+
+@app.get("/readyz", include_in_schema=False)
+async def readiness():
+    checks = await lifecycle.readiness(client)
+    return JSONResponse(status_code=200 if checks["ready"] else 503, content=checks)
+
+@app.exception_handler(ExecutionTimeout)
+async def query_timeout_handler(request, exc):
+    logger.warning(f"Query deadline exceeded on {request.url.path}")
+    return JSONResponse(status_code=503, content={"detail": "Database query timed out"},
+                        headers={"Retry-After": "1"})
+
+@app.exception_handler(ServerSelectionTimeoutError)
+async def database_unavailable_handler(request, exc):
+    logger.error(f"Database unavailable on {request.url.path}: {exc}")
+    return JSONResponse(status_code=503, content={"detail": "Database unavailable"},
+                        headers={"Retry-After": "5"})
+
 # Include the router in the main app
 app.include_router(api_router)
 
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+app.add_middleware(CachePolicyMiddleware)
+
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=rate_limiter,
+    rules={
+        ("POST", "/api/contact"): (CONTACT_RATE_LIMIT, CONTACT_RATE_WINDOW_SECONDS),
+        ("POST", "/api/admin/login"): (LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW_SECONDS),
+    },
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+app.add_middleware(InFlightMiddleware, lifecycle=lifecycle)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # The server has already waited for open connections; SIGTERM drains before that
+    lifecycle.draining = True
+    if boot_task:
+        boot_task.cancel()
+    await catalog_watcher.stop()
+    await contact_writer.stop()
+    await audit_log.stop()
+    await media_pipeline.stop()
+    password_pool.shutdown()
     client.close()
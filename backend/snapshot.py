@@ -0,0 +1,158 @@
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from pydantic import TypeAdapter
+from pymongo import ASCENDING
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+
+from models import CompanyInfo, Project, Service
+from pagination import page_documents
+from serialization import dumps, orjson
+
+# On-disk copy of the public catalog; unset disables it. Point it at a data
+# directory outside the source tree, one file per database
+SNAPSHOT_PATH = os.environ.get('SNAPSHOT_PATH', '')
+# 'mongo' reads MongoDB and falls back to the snapshot when it is unreachable;
+# 'snapshot' serves public reads from the snapshot alone
+CATALOG_SOURCE = os.environ.get('CATALOG_SOURCE', 'mongo').lower()
+# After a failed MongoDB read, public reads use the snapshot this long before trying again
+SNAPSHOT_FALLBACK_SECONDS = float(os.environ.get('SNAPSHOT_FALLBACK_SECONDS', '5'))
+
+SNAPSHOT_MAGIC = b'CATALOG1'
+
+_company_adapter = TypeAdapter(Optional[CompanyInfo])
+_services_adapter = TypeAdapter(List[Service])
+_projects_adapter = TypeAdapter(List[Project])
+
+
+class SnapshotError(Exception):
+    """The snapshot file is truncated, corrupt or in an unknown format."""
+
+
+class CatalogSnapshot:
+    """The public catalog as of one snapshot, answering the public read routes from memory."""
+
+    def __init__(self, version: int, checksum: str, created_at: datetime,
+                 company: Optional[dict], services: List[dict], projects: List[dict]):
+        self.version = version
+        self.checksum = checksum
+        self.created_at = created_at
+        self.company = company
+        self.services = services
+        self.projects = projects
+        self._services_by_id = {service['id']: service for service in services}
+        self._projects_by_id = {project['id']: project for project in projects}
+
+    def service(self, service_id: str) -> Optional[dict]:
+        return self._services_by_id.get(service_id)
+
+    def project(self, project_id: str) -> Optional[dict]:
+        return self._projects_by_id.get(project_id)
+
+    def services_page(self, projection: Optional[dict] = None) -> List[dict]:
+        if not projection:
+            return self.services
+        fields = [name for name, include in projection.items() if include and name != '_id']
+        return [{name: doc[name] for name in fields if name in doc} for doc in self.services]
+
+    def projects_page(self, query: dict, limit: int, after: Optional[str] = None,
+                      projection: Optional[dict] = None) -> Tuple[List[dict], Optional[str]]:
+        # Public project queries only ever filter on exact field values
+        docs = [doc for doc in self.projects
+                if all(doc.get(name) == value for name, value in query.items())]
+        return page_documents(docs, ASCENDING, limit, after, projection)
+
+    def stats(self) -> dict:
+        return {
+            'version': self.version,
+            'checksum': self.checksum,
+            'createdAt': self.created_at.isoformat(),
+        }
+
+
+def catalog_checksum(company: Optional[dict], services: List[dict], projects: List[dict]) -> str:
+    return hashlib.sha256(dumps([company, services, projects])).hexdigest()
+
+
+def write_snapshot(path: str, version: int, company: Optional[dict],
+                   services: List[dict], projects: List[dict]) -> CatalogSnapshot:
+    """Write the catalog atomically as a header line followed by its JSON body.
+
+    The header holds the magic, version, body length and SHA-256 of the body,
+    so a reader can reject a truncated or corrupted file.
+    """
+    created_at = datetime.utcnow()
+    checksum = catalog_checksum(company, services, projects)
+    body = dumps({
+        'version': version,
+        'checksum': checksum,
+        'createdAt': created_at,
+        'company': company,
+        'services': services,
+        'projects': projects,
+    })
+    header = b'%s %d %d %s\n' % (SNAPSHOT_MAGIC, version, len(body), hashlib.sha256(body).hexdigest().encode())
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Replace the file in one rename so readers never see a partial snapshot
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return CatalogSnapshot(version, checksum, created_at, company, services, projects)
+
+
+def load_snapshot(path: str) -> Optional[CatalogSnapshot]:
+    """Map the snapshot file and verify it; None if there is none yet."""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise SnapshotError(f'{path}: empty file')
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with mapped:
+        newline = mapped.find(b'\n')
+        try:
+            if newline < 0:
+                raise ValueError
+            magic, version, length, digest = mapped[:newline].split(b' ')
+            version, length = int(version), int(length)
+        except ValueError:
+            raise SnapshotError(f'{path}: unreadable header')
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f'{path}: unknown format {magic!r}')
+        body = memoryview(mapped)[newline + 1:]
+        try:
+            if len(body) != length:
+                raise SnapshotError(f'{path}: expected {length} bytes, found {len(body)}')
+            if hashlib.sha256(body).hexdigest().encode() != digest:
+                raise SnapshotError(f'{path}: checksum mismatch')
+            data = orjson.loads(body) if orjson is not None else json.loads(bytes(body))
+        finally:
+            body.release()
+
+    # Validation restores the datetimes the JSON round trip turned into strings;
+    # fields the stored documents did not have stay missing, as they are in MongoDB
+    company = _company_adapter.validate_python(data['company'])
+    return CatalogSnapshot(
+        version,
+        data['checksum'],
+        datetime.fromisoformat(data['createdAt']),
+        company.model_dump(exclude_unset=True) if company is not None else None,
+        [doc.model_dump(exclude_unset=True) for doc in _services_adapter.validate_python(data['services'])],
+        [doc.model_dump(exclude_unset=True) for doc in _projects_adapter.validate_python(data['projects'])],
+    )
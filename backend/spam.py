@@ -0,0 +1,240 @@
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+import hashlib
+import os
+import re
+import time
+import unicodedata
+
+# Spam and duplicate filtering for contact messages
+SPAM_FILTER_ENABLED = os.environ.get('SPAM_FILTER_ENABLED', 'true').lower() == 'true'
+# Messages are compared with those received in this window, up to SPAM_INDEX_SIZE of them
+SPAM_WINDOW_SECONDS = float(os.environ.get('SPAM_WINDOW_SECONDS', '3600'))
+SPAM_INDEX_SIZE = int(os.environ.get('SPAM_INDEX_SIZE', '10000'))
+# Repeats of a message merged into the original before further copies are dropped
+SPAM_MAX_DUPLICATES = int(os.environ.get('SPAM_MAX_DUPLICATES', '5'))
+# Near-identical bodies from this many different senders are treated as a campaign
+SPAM_CAMPAIGN_SENDERS = int(os.environ.get('SPAM_CAMPAIGN_SENDERS', '3'))
+SPAM_QUARANTINE_SCORE = int(os.environ.get('SPAM_QUARANTINE_SCORE', '3'))
+SPAM_MAX_LINKS = int(os.environ.get('SPAM_MAX_LINKS', '2'))
+SPAM_QUARANTINE_DAYS = float(os.environ.get('SPAM_QUARANTINE_DAYS', '30'))
+
+SIMHASH_BITS = 64
+# Bodies within this many differing bits are near-duplicates; the index splits each
+# fingerprint into SIMHASH_DISTANCE + 1 bands, so a near-duplicate shares at least one
+SIMHASH_DISTANCE = 3
+SIMHASH_BANDS = SIMHASH_DISTANCE + 1
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+# Shorter bodies ("hello", "call me") are too generic to compare for similarity
+SIMHASH_MIN_WORDS = 8
+# Only the start of very long bodies is fingerprinted
+MAX_FINGERPRINT_WORDS = 2000
+
+WORD_PATTERN = re.compile(r'\w+')
+LINK_PATTERN = re.compile(r'https?://|www\.', re.IGNORECASE)
+MARKUP_PATTERN = re.compile(r'<a\s|\[url[=\]]|\[link[=\]]', re.IGNORECASE)
+REPEATED_CHARS_PATTERN = re.compile(r'(.)\1{9,}')
+
+
+def normalize(text: str) -> str:
+    """Case-folded words only, so spacing, punctuation and case changes fingerprint the same."""
+    return ' '.join(WORD_PATTERN.findall(unicodedata.normalize('NFKC', text).casefold()))
+
+
+def simhash(words) -> int:
+    """64-bit SimHash over word trigrams."""
+    shingles = [' '.join(words[i:i + 3]) for i in range(max(1, len(words) - 2))]
+    hashes = [format(int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'big'), '064b')
+              for s in shingles]
+    threshold = len(hashes) / 2
+    # Count set bits column by column; zip and str.count keep the loop in C
+    fingerprint = 0
+    for column in zip(*hashes):
+        fingerprint = fingerprint << 1 | (column.count('1') > threshold)
+    return fingerprint
+
+
+def spam_score(name: str, message: str, words) -> Tuple[int, list]:
+    """Cheap content heuristics; returns the score and the rules that matched."""
+    rules = []
+    links = len(LINK_PATTERN.findall(message))
+    if links > SPAM_MAX_LINKS:
+        rules.append(('links', 2))
+    if MARKUP_PATTERN.search(message):
+        rules.append(('markup', 2))
+    if LINK_PATTERN.search(name):
+        rules.append(('link_in_name', 3))
+    if REPEATED_CHARS_PATTERN.search(message):
+        rules.append(('repeated_chars', 1))
+    letters = [c for c in message if c.isalpha()]
+    if len(letters) >= 20 and sum(c.isupper() for c in letters) / len(letters) > 0.7:
+        rules.append(('shouting', 1))
+    if len(words) >= 20 and len(set(words)) / len(words) < 0.3:
+        rules.append(('repetitive', 1))
+    if not words:
+        rules.append(('empty', 2))
+    return sum(weight for _, weight in rules), [rule for rule, _ in rules]
+
+
+class IndexEntry:
+    """A recent message, kept by the key of its sender and normalized body."""
+
+    __slots__ = ('key', 'email', 'fingerprint', 'document', 'reason', 'score', 'count', 'seen_at')
+
+    def __init__(self, key: str, email: str, fingerprint: Optional[int], now: float,
+                 reason: Optional[str] = None, score: int = 0):
+        self.key = key
+        self.email = email
+        self.fingerprint = fingerprint
+        # The stored message; set by SpamFilter.remember once it has been written
+        self.document: Optional[dict] = None
+        # Why the message was quarantined, None if it went to the inbox
+        self.reason = reason
+        self.score = score
+        self.count = 0
+        self.seen_at = now
+
+    @property
+    def quarantined(self) -> bool:
+        return self.reason is not None
+
+
+class Verdict(NamedTuple):
+    action: str  # 'accept', 'merge', 'drop' or 'quarantine'
+    # The message to store, or for 'merge' and 'drop' the earlier one it repeats
+    entry: IndexEntry
+
+
+class SpamFilter:
+    """Classifies incoming contact messages against a rolling index of recent ones.
+
+    Exact repeats (same sender, same normalized body) are merged into the
+    first message, inbox or quarantine, and dropped after
+    SPAM_MAX_DUPLICATES. Messages that trip the content heuristics, or
+    whose SimHash is within SIMHASH_DISTANCE bits of messages from
+    several other senders, are quarantined. Only stored messages are
+    indexed. The index is per worker and bounded by size and age.
+    """
+
+    def __init__(self, max_entries: int = SPAM_INDEX_SIZE, window: float = SPAM_WINDOW_SECONDS):
+        self.max_entries = max_entries
+        self.window = window
+        self.counts = {'accepted': 0, 'merged': 0, 'dropped': 0, 'quarantined': 0}
+        self._entries: 'OrderedDict[str, IndexEntry]' = OrderedDict()
+        self._bands: Dict[Tuple[int, int], Set[str]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def check(self, document: dict) -> Verdict:
+        """Classify ``document``; accepted and quarantined messages are only indexed
+        once ``remember`` is called after they were stored."""
+        verdict = self._classify(document)
+        if verdict.action == 'drop':
+            self.counts['dropped'] += 1
+        return verdict
+
+    def remember(self, verdict: Verdict, document: dict):
+        """Index a message that has been stored, in place of any earlier copy."""
+        entry = verdict.entry
+        entry.document = document
+        entry.count = 0
+        if entry.key in self._entries:
+            self._entries.move_to_end(entry.key)
+        else:
+            self._add(entry)
+        self.counts['quarantined' if entry.quarantined else 'accepted'] += 1
+
+    def merged(self):
+        self.counts['merged'] += 1
+
+    def release(self, document: dict):
+        """Later repeats of a message released from quarantine go to the inbox copy."""
+        entry = self._entries.get(self._key(document['email'], self._words(document['message'])))
+        if entry is not None:
+            entry.reason = None
+            entry.score = 0
+            entry.document = document
+
+    def _words(self, message: str):
+        return normalize(message).split()[:MAX_FINGERPRINT_WORDS]
+
+    def _key(self, email: str, words) -> str:
+        email = email.strip().casefold()
+        return hashlib.sha256(f"{email}\n{' '.join(words)}".encode()).hexdigest()[:32]
+
+    def _classify(self, document: dict) -> Verdict:
+        now = time.monotonic()
+        self._expire(now)
+        email = document['email'].strip().casefold()
+        words = self._words(document['message'])
+        key = self._key(email, words)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.count += 1
+            entry.seen_at = now
+            self._entries.move_to_end(key)
+            if entry.count > SPAM_MAX_DUPLICATES:
+                return Verdict('drop', entry)
+            return Verdict('merge', entry)
+
+        fingerprint = simhash(words) if len(words) >= SIMHASH_MIN_WORDS else None
+        score, rules = spam_score(document['name'], document['message'], words)
+        if score >= SPAM_QUARANTINE_SCORE:
+            return Verdict('quarantine', IndexEntry(key, email, fingerprint, now, ','.join(rules), score))
+
+        if fingerprint is not None and SPAM_CAMPAIGN_SENDERS > 1:
+            senders = {candidate.email for candidate in self._near(fingerprint)} - {email}
+            if len(senders) + 1 >= SPAM_CAMPAIGN_SENDERS:
+                return Verdict('quarantine', IndexEntry(key, email, fingerprint, now, 'campaign', score))
+
+        return Verdict('accept', IndexEntry(key, email, fingerprint, now, score=score))
+
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << SIMHASH_BAND_BITS) - 1
+        return [(band, fingerprint >> (band * SIMHASH_BAND_BITS) & mask) for band in range(SIMHASH_BANDS)]
+
+    def _near(self, fingerprint: int):
+        seen = set()
+        for band_key in self._band_keys(fingerprint):
+            for key in self._bands.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                candidate = self._entries[key]
+                if bin(candidate.fingerprint ^ fingerprint).count('1') <= SIMHASH_DISTANCE:
+                    yield candidate
+
+    def _add(self, entry: IndexEntry):
+        self._entries[entry.key] = entry
+        if entry.fingerprint is not None:
+            for band_key in self._band_keys(entry.fingerprint):
+                self._bands.setdefault(band_key, set()).add(entry.key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        if entry.fingerprint is not None:
+            for band_key in self._band_keys(entry.fingerprint):
+                keys = self._bands.get(band_key)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._bands[band_key]
+
+    def _expire(self, now: float):
+        # Entries are kept in order of last use, so expired ones are at the front
+        cutoff = now - self.window
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry.seen_at >= cutoff:
+                break
+            self._remove(entry.key)
+
+    def stats(self) -> dict:
+        return {'enabled': SPAM_FILTER_ENABLED, 'entries': len(self._entries), **self.counts}
+
+
+spam_filter = SpamFilter()
@@ -0,0 +1,193 @@
+from typing import Callable, Optional, Set
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure, PyMongoError
+import asyncio
+import logging
+import os
+import time
+
+# Sync configuration: "off", "changestream" or "poll"
+CATALOG_SYNC_MODE = os.environ.get('CATALOG_SYNC', 'off').lower()
+CATALOG_SYNC_POLL_SECONDS = float(os.environ.get('CATALOG_SYNC_POLL_SECONDS', '2'))
+CATALOG_SYNC_MAX_BACKOFF_SECONDS = 30.0
+# Catalog changes not followed by a version bump within this time were made outside
+# the app (e.g. in the mongo shell) and are acted on by themselves
+CATALOG_SYNC_GRACE_SECONDS = 1.0
+
+CATALOG_COLLECTIONS = ['company_info', 'services', 'projects']
+CATALOG_STATE_ID = 'catalog'
+
+# Server error codes that mean change streams cannot be used on this deployment
+CHANGE_STREAM_UNSUPPORTED_CODES = {40573, 303}
+# Resume token is no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+logger = logging.getLogger(__name__)
+
+
+async def publish_catalog_change(db) -> Optional[int]:
+    """Bump the shared catalog version document and return the new version."""
+    # Also published in changestream mode, whose watchers may fall back to polling
+    if CATALOG_SYNC_MODE == 'off':
+        return None
+    state = await db.catalog_state.find_one_and_update(
+        {'_id': CATALOG_STATE_ID}, {'$inc': {'version': 1}},
+        upsert=True, return_document=ReturnDocument.AFTER
+    )
+    return state['version']
+
+
+class CatalogWatcher:
+    """Follows catalog changes made by any worker and invalidates local state.
+
+    Uses MongoDB change streams when available and falls back to polling a
+    version document when the deployment has no replica set (or when
+    ``CATALOG_SYNC=poll``).
+
+    Changes published through ``publish()`` are remembered by version, so
+    a worker does not refresh a second time for its own writes.
+    """
+
+    def __init__(self, db, on_change: Callable[[], None],
+                 mode: str = CATALOG_SYNC_MODE,
+                 poll_interval: float = CATALOG_SYNC_POLL_SECONDS):
+        self.db = db
+        self.on_change = on_change
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.resume_token = None
+        self.events = 0
+        self.skipped = 0
+        self.reconnects = 0
+        self._own_versions: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.mode == 'off' or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def publish(self):
+        """Tell the other workers about a catalog change this worker already applied."""
+        version = await publish_catalog_change(self.db)
+        if version is not None and self._task is not None:
+            self._own_versions.add(version)
+
+    def _is_own(self, version: Optional[int]) -> bool:
+        own = version in self._own_versions
+        if version is not None:
+            # Versions are seen in order, so older ones will not come back
+            self._own_versions = {v for v in self._own_versions if v > version}
+        if own:
+            self.skipped += 1
+        return own
+
+    def stats(self) -> dict:
+        return {
+            'mode': self.mode,
+            'running': self._task is not None and not self._task.done(),
+            'events': self.events,
+            'skipped': self.skipped,
+            'reconnects': self.reconnects,
+        }
+
+    def _notify(self):
+        self.events += 1
+        self.on_change()
+
+    async def _run(self):
+        if self.mode == 'changestream':
+            await self._watch_changes()
+        await self._poll_version()
+
+    async def _watch_changes(self):
+        # Writes made through the app are followed by a bump of the version document,
+        # which tells whose write it was; other changes wait for CATALOG_SYNC_GRACE_SECONDS
+        pipeline = [{'$match': {'ns.coll': {'$in': CATALOG_COLLECTIONS + ['catalog_state']}}}]
+        backoff = 0.5
+        while True:
+            try:
+                async with self.db.watch(pipeline, resume_after=self.resume_token,
+                                         max_await_time_ms=int(CATALOG_SYNC_GRACE_SECONDS * 500)) as stream:
+                    if self.reconnects:
+                        logger.info('Catalog change stream resumed')
+                    backoff = 0.5
+                    unannounced_since = None
+                    while stream.alive:
+                        change = await stream.try_next()
+                        self.resume_token = stream.resume_token
+                        if change is None:
+                            if (unannounced_since is not None
+                                    and time.monotonic() - unannounced_since >= CATALOG_SYNC_GRACE_SECONDS):
+                                unannounced_since = None
+                                self._notify()
+                            continue
+                        if change['ns']['coll'] != 'catalog_state':
+                            if unannounced_since is None:
+                                unannounced_since = time.monotonic()
+                            continue
+                        unannounced_since = None
+                        if not self._is_own(_state_version(change)):
+                            self._notify()
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                    logger.warning('Change streams unavailable, polling catalog version instead')
+                    self.mode = 'poll'
+                    return
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    # Changes may have been missed; start over from a clean slate
+                    self.resume_token = None
+                    self._notify()
+                else:
+                    logger.error(f'Catalog change stream failed: {e}')
+            except NotImplementedError:
+                logger.warning('Change streams unsupported by client, polling catalog version instead')
+                self.mode = 'poll'
+                return
+            except PyMongoError as e:
+                logger.warning(f'Catalog change stream disconnected: {e}')
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, CATALOG_SYNC_MAX_BACKOFF_SECONDS)
+
+    async def _poll_version(self):
+        last_version = None
+        missed = False
+        while True:
+            try:
+                state = await self.db.catalog_state.find_one({'_id': CATALOG_STATE_ID})
+                version = state['version'] if state else 0
+                if missed:
+                    self._notify()
+                elif last_version is not None and version != last_version:
+                    # Refresh unless every bump since the last poll was our own
+                    foreign = [v for v in range(last_version + 1, version + 1) if not self._is_own(v)]
+                    if foreign or version < last_version:
+                        self._notify()
+                last_version = version
+                missed = False
+            except PyMongoError as e:
+                if not missed:
+                    logger.warning(f'Catalog version poll failed: {e}')
+                    self.reconnects += 1
+                # We cannot tell what changed while disconnected
+                missed = True
+            await asyncio.sleep(self.poll_interval)
+
+
+def _state_version(change: dict) -> Optional[int]:
+    """The catalog version a change to the ``catalog_state`` document set."""
+    updated = change.get('updateDescription', {}).get('updatedFields', {})
+    if 'version' in updated:
+        return updated['version']
+    return (change.get('fullDocument') or {}).get('version')
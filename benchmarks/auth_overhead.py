@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for per-request admin auth overhead (verify_token).
+
+Compares the uncached python-jose path with the decoded-token cache and,
+when PyJWT is installed, the PyJWT backend.
+
+Usage: python benchmarks/auth_overhead.py [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+import auth  # noqa: E402
+
+
+def use_backend(name):
+    auth.JWT_BACKEND = name
+    auth.token_backend, auth._encode_token, auth._decode_token = auth._load_token_backend()
+    return auth.token_backend
+
+
+def measure(label, iterations, cached):
+    token = auth.create_access_token({'sub': 'admin'})
+    credentials = HTTPAuthorizationCredentials(scheme='Bearer', credentials=token)
+    auth.token_cache.clear()
+    auth.token_cache.max_entries = auth.TOKEN_CACHE_SIZE if cached else 0
+
+    async def run():
+        await auth.verify_token(credentials)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await auth.verify_token(credentials)
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(run())
+    per_call_us = elapsed / iterations * 1e6
+    print(f"{label:<28} {per_call_us:>10.2f} us/request")
+    return per_call_us
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"verify_token, {iterations} iterations")
+    print('=' * 50)
+
+    use_backend('jose')
+    baseline = measure('python-jose, no cache', iterations, cached=False)
+    results = {'python-jose, cached': measure('python-jose, cached', iterations, cached=True)}
+
+    if use_backend('pyjwt') == 'pyjwt':
+        results['pyjwt, no cache'] = measure('pyjwt, no cache', iterations, cached=False)
+        results['pyjwt, cached'] = measure('pyjwt, cached', iterations, cached=True)
+
+    print('=' * 50)
+    for label, per_call_us in results.items():
+        print(f"{label:<28} {baseline / per_call_us:>10.1f}x faster than baseline")
+
+
+if __name__ == '__main__':
+    main()
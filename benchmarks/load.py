@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Load-testing and benchmark harness for the PT Navodaya Multi Solusi API.
+
+Runs the FastAPI app in-process (no network, no uvicorn) against the
+MongoDB given by MONGO_URL, or an in-memory mock with --mock, and drives
+concurrent async load on every route. Reports p50/p95/p99 latency,
+throughput and peak Python memory per endpoint, plus the cold-start time
+of a fresh worker process.
+
+Usage:
+    python benchmarks/load.py --mock --save benchmarks/baseline.json
+    python benchmarks/load.py --mock --compare benchmarks/baseline.json --threshold 0.25
+    python benchmarks/load.py --mock --cold-start 5 --requests 0
+"""
+
+# Taken before any other import so cold-start timings include module loading
+import time
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+# Requests per connection in the separate peak-memory pass
+MEMORY_PASS_ROUNDS = 5
+
+# Benchmarks measure the server, not its abuse protection
+os.environ.setdefault('CONTACT_RATE_LIMIT', '1000000000')
+os.environ.setdefault('LOGIN_RATE_LIMIT', '1000000000')
+os.environ.setdefault('DB_NAME', 'navodaya_bench')
+
+
+def load_app(mock: bool):
+    """Import the server module, optionally wired to an in-memory MongoDB."""
+    if mock:
+        from mongomock_motor import AsyncMongoMockClient
+        import motor.motor_asyncio
+
+        os.environ.setdefault('MONGO_URL', 'mongodb://mock')
+        motor.motor_asyncio.AsyncIOMotorClient = lambda *args, **kwargs: AsyncMongoMockClient()
+    else:
+        os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+    return server
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_scenarios(token, service_id, project_id, requests):
+    auth = {'Authorization': f'Bearer {token}'}
+    contact = {'name': 'Load Test', 'email': 'load@example.com', 'message': 'Benchmark message'}
+    light = max(1, requests // 10)
+    return [
+        # name, method, path, body, headers, number of requests
+        ('GET /api/company', 'GET', '/api/company', None, {}, requests),
+        ('GET /api/services', 'GET', '/api/services', None, {}, requests),
+        ('GET /api/services/{id}', 'GET', f'/api/services/{service_id}', None, {}, requests),
+        ('GET /api/projects', 'GET', '/api/projects', None, {}, requests),
+        ('GET /api/projects/{id}', 'GET', f'/api/projects/{project_id}', None, {}, requests),
+        ('GET /api/projects?fields', 'GET', '/api/projects?fields=title,category&limit=20', None, {}, requests),
+        ('GET /api/site', 'GET', '/api/site', None, {}, requests),
+        ('GET /api/site?fields', 'GET', '/api/site?fields=title,category,icon,description', None, {}, requests),
+        ('GET /api/search', 'GET', '/api/search?q=infra', None, {}, requests),
+        ('POST /api/contact', 'POST', '/api/contact', contact, {}, requests),
+        ('GET /api/admin/messages', 'GET', '/api/admin/messages?limit=50', None, auth, requests),
+        ('GET /api/admin/stats', 'GET', '/api/admin/stats', None, auth, requests),
+        ('PUT /api/admin/services/{id}', 'PUT', f'/api/admin/services/{service_id}',
+         {'description': 'Benchmark update'}, auth, light),
+        ('GET /api/admin/export/messages', 'GET', '/api/admin/export/messages', None, auth, light),
+        ('POST /api/admin/login', 'POST', '/api/admin/login',
+         {'username': 'admin', 'password': 'admin'}, {}, light),
+    ]
+
+
+async def drive(client, method, path, body, headers, total, concurrency):
+    """Send ``total`` requests over ``concurrency`` connections; returns (latencies, errors)."""
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def run_scenario(client, method, path, body, headers, total, concurrency):
+    started = time.perf_counter()
+    latencies, errors = await drive(client, method, path, body, headers, total, concurrency)
+    elapsed = time.perf_counter() - started
+
+    # tracemalloc slows the interpreter several times over, and in --mock mode the
+    # server shares it, so peak memory gets its own untimed pass. Peak memory follows
+    # the requests in flight, so a few rounds at the same concurrency are enough.
+    tracemalloc.start()
+    await drive(client, method, path, body, headers, min(total, concurrency * MEMORY_PASS_ROUNDS), concurrency)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'throughput_rps': round(total / elapsed, 1),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+async def wait_ready(client, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while (await client.get('/readyz')).status_code != 200:
+        if time.perf_counter() > deadline:
+            raise RuntimeError('server did not become ready')
+        await asyncio.sleep(0.01)
+
+
+async def measure_cold_start(mock):
+    """Child-process side of --cold-start: time one worker from process start to serving."""
+    imported_at = time.perf_counter()
+    server = load_app(mock)
+    imported = time.perf_counter() - imported_at
+    import httpx
+
+    await server.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            first = await client.get('/api/services')
+            first.raise_for_status()
+            first_request = time.perf_counter() - PROCESS_STARTED
+            await wait_ready(client)
+            ready = time.perf_counter() - PROCESS_STARTED
+    finally:
+        await server.app.router.shutdown()
+    return {
+        'import_ms': round(imported * 1000, 1),
+        'first_request_ms': round(first_request * 1000, 1),
+        'ready_ms': round(ready * 1000, 1),
+    }
+
+
+def run_cold_starts(runs, mock):
+    """Start ``runs`` fresh interpreters and report the median of each timing."""
+    command = [sys.executable, __file__, '--cold-start-child'] + (['--mock'] if mock else [])
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        sample['process_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        samples.append(sample)
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+async def run_benchmarks(server, requests, concurrency, warmup):
+    import httpx
+
+    await server.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            await wait_ready(client)
+            login = await client.post('/api/admin/login', json={'username': 'admin', 'password': 'admin'})
+            login.raise_for_status()
+            token = login.json()['access_token']
+            service_id = (await client.get('/api/services')).json()[0]['id']
+            project_id = (await client.get('/api/projects')).json()[0]['id']
+
+            results = {}
+            for name, method, path, body, headers, total in build_scenarios(
+                token, service_id, project_id, requests
+            ):
+                if warmup:
+                    await run_scenario(client, method, path, body, headers, min(warmup, total), 1)
+                results[name] = await run_scenario(
+                    client, method, path, body, headers, total, concurrency
+                )
+                print_row(name, results[name])
+            return results
+    finally:
+        await server.app.router.shutdown()
+
+
+def print_header():
+    print(f"{'endpoint':<34} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9} {'peak KB':>9} {'err':>5}")
+    print('=' * 86)
+
+
+def print_row(name, result):
+    print(
+        f"{name:<34} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+        f"{result['throughput_rps']:>9.1f} {result['peak_memory_kb']:>9.1f} {result['errors']:>5}"
+    )
+
+
+def compare(results, baseline, threshold, cold_start=None):
+    """Return a list of regressions beyond ``threshold`` (a fraction, e.g. 0.25)."""
+    regressions = []
+    before = baseline.get('cold_start')
+    if cold_start and before and before['first_request_ms']:
+        if cold_start['first_request_ms'] > before['first_request_ms'] * (1 + threshold):
+            regressions.append(
+                f"cold start: first request {before['first_request_ms']}ms -> {cold_start['first_request_ms']}ms"
+            )
+    for name, result in results.items():
+        before = baseline.get('endpoints', {}).get(name)
+        if not before:
+            continue
+        if before['p95_ms'] and result['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms")
+        if before['throughput_rps'] and result['throughput_rps'] < before['throughput_rps'] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']} -> {result['throughput_rps']} req/s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mock', action='store_true', help='use an in-memory MongoDB mock')
+    parser.add_argument('--requests', type=int, default=500, help='requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=20, help='concurrent clients')
+    parser.add_argument('--warmup', type=int, default=20, help='warm-up requests per endpoint')
+    parser.add_argument('--save', metavar='PATH', help='write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed regression as a fraction (default 0.25)')
+    parser.add_argument('--cold-start', type=int, default=0, metavar='RUNS',
+                        help='measure time-to-first-request of RUNS fresh worker processes')
+    parser.add_argument('--cold-start-child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start_child:
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(asyncio.run(measure_cold_start(args.mock))))
+        return
+
+    cold_start = None
+    if args.cold_start:
+        cold_start = run_cold_starts(args.cold_start, args.mock)
+        print(f"cold start (median of {args.cold_start}): process {cold_start['process_ms']}ms, "
+              f"imports {cold_start['import_ms']}ms, first request {cold_start['first_request_ms']}ms, "
+              f"ready {cold_start['ready_ms']}ms\n")
+
+    results = {}
+    if args.requests:
+        server = load_app(args.mock)
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+        print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}, "
+              f"{'mock' if args.mock else os.environ['MONGO_URL']}")
+        print_header()
+        results = asyncio.run(run_benchmarks(server, args.requests, args.concurrency, args.warmup))
+
+    report = {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'requests': args.requests, 'concurrency': args.concurrency, 'mock': args.mock},
+        'endpoints': results,
+    }
+    if cold_start:
+        report['cold_start'] = cold_start
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2) + '\n')
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline, args.threshold, cold_start)
+        if regressions:
+            print(f"\nREGRESSIONS (threshold {args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
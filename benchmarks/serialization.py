@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the model/serialization hot paths.
+
+Compares the previous request handling (pydantic v1-style ``Model(**x.dict())``
+round trips, re-validating documents read from MongoDB, jsonable_encoder +
+json.dumps) with the current one (validation in pydantic-core, a single
+model_dump, JSON bytes straight from pydantic-core, or orjson for trusted
+reads). Reports time and peak allocation per operation.
+
+Usage: python benchmarks/serialization.py [iterations]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from models import ContactMessage, ContactMessageCreate, Project, Service, ServiceCreate  # noqa: E402
+from seed_data import projects_seed, services_seed  # noqa: E402
+from serialization import dumps, orjson  # noqa: E402
+
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+service_adapter = TypeAdapter(Service)
+message_adapter = TypeAdapter(ContactMessage)
+projects_adapter = TypeAdapter(List[Project])
+messages_adapter = TypeAdapter(List[ContactMessage])
+
+# Documents as they come back from MongoDB (no _id, datetimes as datetime)
+PROJECT_DOCS = [dict(doc, id=f'{doc["id"]}-{i}', createdAt=datetime.utcnow())
+                for i in range(20) for doc in projects_seed]
+MESSAGE_DOCS = [ContactMessage(name=f'n{i}', email='a@example.com', message='Hello ' * 20).model_dump()
+                for i in range(100)]
+SERVICE_BODY = {key: value for key, value in services_seed[0].items() if key != 'id'}
+CONTACT_BODY = {'name': 'Load Test', 'email': 'load@example.com', 'message': 'Benchmark message'}
+
+
+def create_service_before():
+    service = ServiceCreate(**SERVICE_BODY)
+    service_obj = Service(**service.dict())
+    document = service_obj.dict()
+    service_obj.dict()  # search index copy
+    return json.dumps(jsonable_encoder(service_obj)).encode(), document
+
+
+def create_service_after():
+    service = ServiceCreate(**SERVICE_BODY)
+    service_obj = Service.model_validate(service.model_dump())
+    document = service_obj.model_dump()
+    return service_adapter.dump_json(service_obj), document
+
+
+def contact_before():
+    message = ContactMessageCreate(**CONTACT_BODY)
+    contact_msg = ContactMessage(**message.dict())
+    document = contact_msg.dict()
+    return json.dumps(jsonable_encoder(contact_msg)).encode(), document
+
+
+def contact_after():
+    message = ContactMessageCreate(**CONTACT_BODY)
+    contact_msg = ContactMessage.model_validate(message.model_dump())
+    document = contact_msg.model_dump()
+    return message_adapter.dump_json(contact_msg), document
+
+
+def projects_read_before():
+    return projects_adapter.dump_json(projects_adapter.validate_python(PROJECT_DOCS))
+
+
+def projects_read_trusted():
+    return dumps(PROJECT_DOCS)
+
+
+def messages_response_before():
+    # FastAPI response_model path: validate, encode to JSON-able dicts, json.dumps
+    return json.dumps(jsonable_encoder(messages_adapter.validate_python(MESSAGE_DOCS))).encode()
+
+
+def messages_response_after():
+    return messages_adapter.dump_json(messages_adapter.validate_python(MESSAGE_DOCS))
+
+
+def partial_messages_before():
+    return json.dumps(jsonable_encoder(MESSAGE_DOCS)).encode()
+
+
+def partial_messages_after():
+    return dumps(MESSAGE_DOCS)
+
+
+CASES = [
+    ('POST /api/admin/services', create_service_before, create_service_after),
+    ('POST /api/contact', contact_before, contact_after),
+    (f'projects, TRUSTED_READS ({len(PROJECT_DOCS)})', projects_read_before, projects_read_trusted),
+    (f'admin messages ({len(MESSAGE_DOCS)} docs)', messages_response_before, messages_response_after),
+    ('admin messages ?fields', partial_messages_before, partial_messages_after),
+]
+
+
+def measure(func, iterations):
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    per_call_us = (time.perf_counter() - started) / iterations * 1e6
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call_us, peak / 1024
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{iterations} iterations, JSON encoder for plain data: {'orjson' if orjson else 'pydantic-core'}")
+    print(f"{'operation':<34} {'before us':>10} {'after us':>10} {'speedup':>8} {'before KB':>10} {'after KB':>9}")
+    print('=' * 86)
+    for name, before, after in CASES:
+        before_us, before_kb = measure(before, iterations)
+        after_us, after_kb = measure(after, iterations)
+        print(f"{name:<34} {before_us:>10.1f} {after_us:>10.1f} {before_us / after_us:>7.1f}x "
+              f"{before_kb:>10.1f} {after_kb:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
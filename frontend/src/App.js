@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { BrowserRouter, Routes, Route, useLocation } from 'react-router-dom';
 import Header from './components/Header';
 import Hero from './components/Hero';
@@ -12,17 +12,29 @@ import ProjectDetail from './components/ProjectDetail';
 import AdminLogin from './components/AdminLogin';
 import AdminDashboard from './components/AdminDashboard';
 import { Toaster } from './components/ui/toaster';
+import { getSite, LANDING_FIELDS } from './utils/api';
 import './App.css';
 
-const HomePage = () => (
-  <>
-    <Hero />
-    <About />
-    <Services />
-    <Projects />
-    <Contact />
-  </>
-);
+const HomePage = () => {
+  const [site, setSite] = useState(null);
+
+  useEffect(() => {
+    // One bootstrap request for the whole page; the bundled content stays up if it fails
+    getSite({ fields: LANDING_FIELDS })
+      .then((res) => setSite(res.data))
+      .catch((error) => console.error('Error fetching site:', error));
+  }, []);
+
+  return (
+    <>
+      <Hero company={site?.company || undefined} />
+      <About company={site?.company || undefined} />
+      <Services services={site?.services} />
+      <Projects projects={site?.projects} />
+      <Contact />
+    </>
+  );
+};
 
 const AppContent = () => {
   const location = useLocation();
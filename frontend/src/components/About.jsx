@@ -3,7 +3,7 @@ import { CheckCircle, Target, Award, Users } from 'lucide-react';
 import { companyInfo } from '../data/mock';
 import { Card } from './ui/card';
 
-const About = () => {
+const About = ({ company = companyInfo }) => {
   const values = [
     {
       icon: Target,
@@ -44,13 +44,13 @@ const About = () => {
           {/* Text Content */}
           <div className="space-y-6">
             <h3 className="text-3xl font-bold text-[#1A237E]">
-              {companyInfo.name}
+              {company.name}
             </h3>
             <p className="text-gray-600 text-lg leading-relaxed">
-              {companyInfo.description}
+              {company.description}
             </p>
             <p className="text-gray-600 text-lg leading-relaxed">
-              {companyInfo.mission}
+              {company.mission}
             </p>
             <div className="pt-4">
               <div className="flex items-start gap-3 mb-3">
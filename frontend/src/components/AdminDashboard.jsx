@@ -4,7 +4,7 @@ import { Card } from './ui/card';
 import { Button } from './ui/button';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from './ui/tabs';
 import { LogOut, Building, Briefcase, FolderKanban, Mail } from 'lucide-react';
-import { getCompanyInfo, getServices, getProjects, getContactMessages } from '../utils/api';
+import { getSite, getProjects, getContactMessages } from '../utils/api';
 import { useToast } from '../hooks/use-toast';
 import { companyInfo } from '../data/mock';
 
@@ -30,16 +30,23 @@ const AdminDashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [companyRes, servicesRes, projectsRes, messagesRes] = await Promise.all([
-        getCompanyInfo(),
-        getServices(),
-        getProjects(),
+      const [siteRes, messagesRes] = await Promise.all([
+        getSite(),
         getContactMessages().catch(() => ({ data: [] }))
       ]);
 
-      setCompany(companyRes.data);
-      setServices(servicesRes.data);
-      setProjects(projectsRes.data);
+      // The bootstrap only carries the first page of projects; fetch the rest by cursor
+      const allProjects = [...siteRes.data.projects];
+      let cursor = siteRes.data.projectsNextCursor;
+      while (cursor) {
+        const pageRes = await getProjects({ after: cursor });
+        allProjects.push(...pageRes.data);
+        cursor = pageRes.headers['x-next-cursor'];
+      }
+
+      setCompany(siteRes.data.company);
+      setServices(siteRes.data.services);
+      setProjects(allProjects);
       setMessages(messagesRes.data);
     } catch (error) {
       console.error('Error fetching data:', error);
@@ -3,7 +3,7 @@ import { Button } from './ui/button';
 import { ArrowRight, PlayCircle } from 'lucide-react';
 import { companyInfo } from '../data/mock';
 
-const Hero = () => {
+const Hero = ({ company = companyInfo }) => {
   const scrollToSection = (id) => {
     const element = document.getElementById(id);
     if (element) {
@@ -36,12 +36,12 @@ const Hero = () => {
 
           {/* Main Heading */}
           <h1 className="text-5xl md:text-7xl font-bold text-[#1A237E] leading-tight">
-            {companyInfo.tagline}
+            {company.tagline}
           </h1>
 
           {/* Subline */}
           <p className="text-xl md:text-2xl text-gray-600 max-w-3xl mx-auto leading-relaxed">
-            {companyInfo.subline}
+            {company.subline}
           </p>
 
           {/* CTA Buttons */}
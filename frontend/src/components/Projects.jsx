@@ -2,10 +2,11 @@ import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Card } from './ui/card';
 import { Calendar, ExternalLink } from 'lucide-react';
-import { projects } from '../data/mock';
+import { projects as mockProjects } from '../data/mock';
 import { Button } from './ui/button';
+import { imageSrcSet, mediaUrl } from '../utils/api';
 
-const Projects = () => {
+const Projects = ({ projects = mockProjects }) => {
   const navigate = useNavigate();
   const [filter, setFilter] = useState('All');
 
@@ -57,7 +58,9 @@ const Projects = () => {
               {/* Project Image */}
               <div className="relative h-56 overflow-hidden bg-gray-200">
                 <img
-                  src={project.image}
+                  src={mediaUrl(project.image)}
+                  srcSet={imageSrcSet(project.imageVariants)}
+                  sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                   alt={project.title}
                   className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-500"
                 />
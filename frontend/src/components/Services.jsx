@@ -2,7 +2,7 @@ import React from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Card } from './ui/card';
 import { Server, Network, Briefcase, ArrowRight } from 'lucide-react';
-import { services } from '../data/mock';
+import { services as mockServices } from '../data/mock';
 import { Button } from './ui/button';
 
 const iconMap = {
@@ -11,7 +11,7 @@ const iconMap = {
   briefcase: Briefcase
 };
 
-const Services = () => {
+const Services = ({ services = mockServices }) => {
   const navigate = useNavigate();
 
   return (
@@ -32,7 +32,7 @@ const Services = () => {
         {/* Services Grid */}
         <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-8">
           {services.map((service) => {
-            const Icon = iconMap[service.icon];
+            const Icon = iconMap[service.icon] || Briefcase;
             return (
               <Card
                 key={service.id}
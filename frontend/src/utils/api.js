@@ -24,20 +24,46 @@ api.interceptors.request.use((config) => {
 export const getCompanyInfo = () => api.get('/company');
 export const getServices = () => api.get('/services');
 export const getService = (id) => api.get(`/services/${id}`);
-export const getProjects = () => api.get('/projects');
+export const getProjects = (params) => api.get('/projects', { params });
 export const getProject = (id) => api.get(`/projects/${id}`);
+export const getSite = (params) => api.get('/site', { params });
+// Fields the landing page renders; leaves out detailedContent, which only the detail pages show
+export const LANDING_FIELDS = 'category,icon,description,features,title,year,image,imageVariants';
+
+// Uploaded images are served by the backend under relative /api/media URLs
+export const mediaUrl = (url) => (url && url.startsWith('/') ? `${BACKEND_URL}${url}` : url);
+export const imageSrcSet = (variants, format = 'webp') =>
+  (variants || [])
+    .filter((variant) => variant.format === format)
+    .map((variant) => `${mediaUrl(variant.url)} ${variant.width}w`)
+    .join(', ') || undefined;
+export const searchCatalog = (q, params) => api.get('/search', { params: { q, ...params } });
 export const submitContactForm = (data) => api.post('/contact', data);
 
 // Admin API calls
 export const adminLogin = (credentials) => api.post('/admin/login', credentials);
-export const updateCompanyInfo = (data) => api.put('/admin/company', data);
+// Pass the document's `version` to reject the update (412) if someone else changed it meanwhile
+const ifMatch = (version) => (version === undefined ? {} : { headers: { 'If-Match': `"${version}"` } });
+export const updateCompanyInfo = (data, version) => api.put('/admin/company', data, ifMatch(version));
 export const createService = (data) => api.post('/admin/services', data);
-export const updateService = (id, data) => api.put(`/admin/services/${id}`, data);
+export const updateService = (id, data, version) => api.put(`/admin/services/${id}`, data, ifMatch(version));
 export const deleteService = (id) => api.delete(`/admin/services/${id}`);
 export const createProject = (data) => api.post('/admin/projects', data);
-export const updateProject = (id, data) => api.put(`/admin/projects/${id}`, data);
+export const updateProject = (id, data, version) => api.put(`/admin/projects/${id}`, data, ifMatch(version));
 export const deleteProject = (id) => api.delete(`/admin/projects/${id}`);
-export const getContactMessages = () => api.get('/admin/messages');
+export const getContactMessages = (params) => api.get('/admin/messages', { params });
 export const deleteContactMessage = (id) => api.delete(`/admin/messages/${id}`);
+export const bulkServices = (data) => api.post('/admin/services/bulk', data);
+export const bulkProjects = (data) => api.post('/admin/projects/bulk', data);
+export const bulkContactMessages = (data) => api.post('/admin/messages/bulk', data);
+export const uploadMedia = (file, target) => {
+  const form = new FormData();
+  form.append('file', file);
+  return api.post('/admin/media', form, {
+    params: target ? { target } : undefined,
+    headers: { 'Content-Type': 'multipart/form-data' }
+  });
+};
+export const getMediaAsset = (id) => api.get(`/admin/media/${id}`);
 
 export default api;